@@ -0,0 +1,86 @@
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from cf.cash_flow import CashFlow, Point
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+# The dict-backed layout `Time` and `Point` had before they were slotted.
+@dataclass
+class DictTime:
+    time: float = 0.0
+
+
+@dataclass
+class DictPoint:
+    time: DictTime
+    value: float
+
+    def present_value(self, policy: DiscountContext) -> float:
+        return self.value * policy(self.time)
+
+
+def _object_size(obj) -> int:
+    """Bytes of `obj` plus its instance dict, if it has one."""
+    return sys.getsizeof(obj) + (sys.getsizeof(vars(obj)) if hasattr(obj, "__dict__") else 0)
+
+
+def footprint(held) -> float:
+    """
+    Resident size in MiB of a point list or a cash flow. Points are homogeneous, so one point's
+    objects (point, time and both floats) times the count is exact, without tracing 10M objects.
+    """
+    if isinstance(held, CashFlow):
+        return (held.times.nbytes + held.values.nbytes) / 2 ** 20
+    point = held[0]
+    per_point = sum(map(_object_size, (point, point.time, point.time.time, point.value)))
+    return (sys.getsizeof(held) + len(held) * per_point) / 2 ** 20
+
+
+def main(n: int):
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.uniform(0, 30, n))
+    values = rng.uniform(-100, 100, n)
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+
+    print(f"{n:,} points")
+    print(f"{'layout':<24}{'memory (MiB)':>14}{'pv (s)':>10}{'points/s':>14}")
+
+    def report(name: str, build: Callable, price: Callable):
+        held = build()
+        memory = footprint(held)
+        start = time.perf_counter()
+        pv = price(held)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24}{memory:>14.1f}{elapsed:>10.2f}{n / elapsed:>14.3g}   pv={pv:.6f}")
+
+    # Per-point objects priced one at a time through the scalar kernel.
+    report(
+        "dict Point list",
+        lambda: [DictPoint(DictTime(t), v) for t, v in zip(times.tolist(), values.tolist())],
+        lambda points: sum(p.present_value(policy) for p in points),
+    )
+    report(
+        "slotted Point list",
+        lambda: [Point(Time(t), v) for t, v in zip(times.tolist(), values.tolist())],
+        lambda points: sum(p.present_value(policy) for p in points),
+    )
+    # Contiguous arrays priced by the vector kernel: no per-point objects at all.
+    report(
+        "CashFlow arrays",
+        lambda: CashFlow.from_arrays(times.copy(), values.copy()),
+        lambda cash_flow: cash_flow.present_value(policy),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory and pricing throughput of cash flow layouts.")
+    parser.add_argument("--points", type=int, default=10_000_000)
+    main(parser.parse_args().points)
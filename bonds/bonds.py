@@ -1,13 +1,34 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 from investing.asset import Asset
-from cf.cash_flow import Point
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow, Point
+from cf.closed_form import closed_form_applies, stream_moments
 from rates.compound import continous_discount, yearly_discount
 from rates.discount_context import DiscountContext
-from rates.time import Time
+
+
+@lru_cache(maxsize=65536)
+def _schedule(coupon_rate: float, face_value: float, periods: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Read-only coupon schedule, shared by every bond with the same spec."""
+    times = np.arange(periods) / m
+    values = np.full(periods, coupon_rate / m * face_value)
+    values[-1] += face_value
+    times.flags.writeable = values.flags.writeable = False
+    return times, values
+
 
 @dataclass
 class Bond(Asset):
+    """
+    Level-coupon bond. The schedule is not stored per bond: `times`/`values` come from a cache
+    shared by identical specs, and points are only built when iterated. Under flat discounting,
+    pricing and risk use closed-form annuity sums instead of the schedule.
+    """
     coupon_rate: float
     face_value: float
     periods: int
@@ -18,14 +39,59 @@ class Bond(Asset):
         self.face_value = face_value
         self.periods = periods
         self.m = m
-        cash_flow = [
-            Point(
-                Time(k / self.m), 
-                self.coupon_rate / self.m * self.face_value
-            ) for k in range(self.periods)
-        ]
-        cash_flow[-1].value += self.face_value
-        super().__init__(cash_flow, name)
+        self.name = name
+
+    @property
+    def times(self) -> np.ndarray:
+        return _schedule(self.coupon_rate, self.face_value, self.periods, self.m)[0]
+
+    @property
+    def values(self) -> np.ndarray:
+        return _schedule(self.coupon_rate, self.face_value, self.periods, self.m)[1]
+
+    @property
+    def cash_flow(self) -> List[Point]:
+        return CashFlow.cash_flow.fget(self)
+
+    @cash_flow.setter
+    def cash_flow(self, cash_flow: List[Point]):
+        raise AttributeError(
+            "A Bond's schedule follows from its coupon_rate, face_value, periods and m; "
+            "change those, or use an Asset for a custom schedule"
+        )
+
+    def length(self) -> int:
+        return self.periods
+
+    def _closed_form_moments(self, policy: DiscountContext) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """A level coupon stream from time 0 plus the redemption, a one-payment stream at maturity."""
+        coupons = stream_moments(policy, self.coupon_rate / self.m * self.face_value, self.periods, self.m)
+        redemption = stream_moments(policy, self.face_value, 1, self.m, start=(self.periods - 1) / self.m)
+        return tuple(c + r for c, r in zip(coupons, redemption))
+
+    def present_value(self, policy: DiscountContext) -> float:
+        if not closed_form_applies(policy):
+            return super().present_value(policy)
+        return self._closed_form_moments(policy)[0]
+
+    def moments(self, policy: DiscountContext) -> Tuple[float, float, float]:
+        if not closed_form_applies(policy):
+            return super().moments(policy)
+        return self._closed_form_moments(policy)
+
+
+def pack_bonds(bonds: Sequence[Bond]) -> CashFlowBatch:
+    """Schedules of many bonds packed straight from their specs, without building them one by one."""
+    coupon_rate, face_value, periods, m = (
+        np.array([getattr(bond, spec) for bond in bonds], dtype=dtype)
+        for spec, dtype in (("coupon_rate", float), ("face_value", float), ("periods", np.int64), ("m", float))
+    )
+    offsets = np.zeros(len(bonds) + 1, dtype=np.int64)
+    np.cumsum(periods, out=offsets[1:])
+    k = np.arange(offsets[-1]) - np.repeat(offsets[:-1], periods)
+    values = np.repeat(coupon_rate / m * face_value, periods)
+    values[offsets[1:][periods > 0] - 1] += face_value[periods > 0]
+    return CashFlowBatch(k / np.repeat(m, periods), values, offsets)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,35 @@
+from typing import Callable, List, Union
+
 import numpy as np
 import matplotlib.pyplot as plt
 
 from bonds.bonds import Bond
+from cf.batch import CashFlowBatch
 from rates.compound import yearly_discount
 from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+def price_yield(
+    bonds: Union[Bond, List[Bond]],
+    yields: np.ndarray,
+    discount: Callable = yearly_discount,
+    now: Time = None,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Price every bond at every yield in one broadcasted evaluation.
+    Returns a `(len(bonds), len(yields))` matrix, or a `(len(yields),)` vector for a single bond.
+    """
+    batch = CashFlowBatch.from_cash_flows([bonds] if isinstance(bonds, Bond) else bonds)
+    policy = DiscountContext(discount, now or Time(), {**kwargs, "y": np.asarray(yields, dtype=float)})
+    prices = batch.present_values(policy).T
+    return prices[0] if isinstance(bonds, Bond) else prices
 
 
 def plot_price_yield(ax: plt.Axes, bond: Bond):
     yields = np.linspace(0, 1, 100)
-    prices = [bond.present_value(DiscountContext(yearly_discount, kwargs={"y": y})) for y in yields]
-    ax.plot(yields, prices, label=bond.name)
+    ax.plot(yields, price_yield(bond, yields), label=bond.name)
       
 
 if __name__ == "__main__":
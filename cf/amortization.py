@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from cf.closed_form import geometric_moments
+from math_utils.newton_raphson import newton_raphson_vectorized
+from rates.compound import compounding_frequency, vectorized, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+# Loans pay `payment` at the end of each of `periods` periods, `payments_per_year` per year, and
+# are discounted with the kernel `discount` at yield `y` (further `kwargs`, such as the `m` of
+# `periodic_discount`, go to the kernel). Every argument broadcasts elementwise, so a whole book
+# of loans is one call.
+
+
+def period_discount(
+    y: np.ndarray,
+    payments_per_year: int = 12,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> np.ndarray:
+    """Discount factor over one payment period, `1 / (1 + i)` for the periodic rate `i`."""
+    y, per_year = np.broadcast_arrays(np.asarray(y, dtype=float), np.asarray(payments_per_year, dtype=float))
+    kernel = vectorized(discount)
+    if kernel is not None:
+        # The kernel directly, rather than `DiscountContext.discount_factors`: yields must pair
+        # with their own periods, not add a scenario axis.
+        return kernel(1 / per_year, 0.0, y=y, **kwargs)
+    return np.vectorize(
+        lambda yi, pi: DiscountContext(discount, kwargs={**kwargs, "y": yi})(Time(1 / pi)), otypes=[float],
+    )(y, per_year)
+
+
+def _annuity_factor(v: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Present value of 1 paid at the end of each of `periods` periods: `sum(v ** k for k in 1..n)`."""
+    return v * geometric_moments(v, periods)[0]
+
+
+def level_payment(
+    principal: np.ndarray,
+    y: np.ndarray,
+    periods: np.ndarray,
+    payments_per_year: int = 12,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> np.ndarray:
+    """Payment repaying `principal` in `periods` equal installments (closed form)."""
+    return principal / _annuity_factor(period_discount(y, payments_per_year, discount, **kwargs), periods)
+
+
+def loan_term(
+    principal: np.ndarray,
+    payment: np.ndarray,
+    y: np.ndarray,
+    payments_per_year: int = 12,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Number of periods (fractional) for `payment` to repay `principal` (closed form);
+    `inf` when the payment does not cover the interest.
+    """
+    v = period_discount(y, payments_per_year, discount, **kwargs)
+    rate = 1 / v - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        remaining = 1 - principal * rate / payment
+        return np.where(
+            rate == 0,
+            principal / payment,
+            np.where(remaining > 0, np.log(remaining) / np.log(v), np.inf),
+        )
+
+
+def loan_rate(
+    principal: np.ndarray,
+    payment: np.ndarray,
+    periods: np.ndarray,
+    payments_per_year: int = 12,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Yield `y` (in the convention of `discount`) at which the payments repay the principal.
+    Solved for all loans at once by safeguarded Newton on the period discount factor.
+    """
+    principal, payment, periods = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (principal, payment, periods))
+    )
+
+    def residual(v: np.ndarray):
+        g0, g1, _ = geometric_moments(v, periods)
+        # d/dv (v * g0) = g0 + v * g0' = g0 + g1
+        return payment * v * g0 - principal, payment * (g0 + g1)
+
+    v, converged = newton_raphson_vectorized(residual, np.full(principal.shape, 0.99), 1e-6, 2.0)
+    v = np.where(converged, v, np.nan)
+    # Back to a yield: one period at frequency p is 1 / (1 + i) = (1 + y / c) ** (-c / p) for compounding c.
+    c = compounding_frequency(discount, kwargs)
+    p = np.asarray(payments_per_year, dtype=float)
+    rate = 1 / v - 1
+    return p * np.log1p(rate) if np.all(np.isinf(c)) else c * ((1 + rate) ** (p / c) - 1)
+
+
+@dataclass
+class AmortizationSchedule:
+    """
+    Per-period arrays of shape `(..., max(periods))`, zero after each loan's last period.
+    `times` broadcasts against them (one row per loan when payment frequencies differ).
+    """
+    times: np.ndarray
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+
+
+def amortization_schedule(
+    principal: np.ndarray,
+    y: np.ndarray,
+    periods: np.ndarray,
+    payments_per_year: int = 12,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> AmortizationSchedule:
+    """Level-payment schedules of a batch of loans, from the closed-form outstanding balance."""
+    principal, y, periods, per_year = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (principal, y, periods, payments_per_year))
+    )
+    v = period_discount(y, per_year, discount, **kwargs)[..., None]
+    payment = level_payment(principal, y, periods, per_year, discount, **kwargs)[..., None]
+    principal, periods, per_year = principal[..., None], periods[..., None], per_year[..., None]
+
+    k = np.arange(1, int(periods.max(initial=0)) + 1)
+    active = k <= periods
+    # Balance after k payments: principal minus the value of those payments, both grown to period k.
+    balance = np.where(active, (principal - payment * _annuity_factor(v, k)) / v ** k, 0.0)
+    previous = np.concatenate([principal, balance[..., :-1]], axis=-1)
+    interest = np.where(active, previous * (1 / v - 1), 0.0)
+    payments = np.where(active, payment, 0.0)
+    return AmortizationSchedule(
+        times=k / per_year,
+        payment=payments,
+        interest=interest,
+        principal=payments - interest,
+        balance=balance,
+    )
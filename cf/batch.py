@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cf.cash_flow import CashFlow, RiskMetrics
+from math_utils.newton_raphson import newton_raphson_vectorized
+from rates.compound import compounding_frequency, vectorized, yearly_discount
+from rates.discount_context import DiscountContext
+
+
+@dataclass
+class CashFlowBatch:
+    """
+    Many cash flows packed end to end in shared `times`/`values` arrays.
+    Flow `i` spans `offsets[i]:offsets[i + 1]`.
+    """
+    times: np.ndarray
+    values: np.ndarray
+    offsets: np.ndarray
+
+    @classmethod
+    def from_cash_flows(cls, cash_flows: Sequence[CashFlow]) -> "CashFlowBatch":
+        lengths = np.fromiter((cf.length() for cf in cash_flows), dtype=np.int64, count=len(cash_flows))
+        offsets = np.zeros(len(cash_flows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if len(cash_flows) == 0:
+            return cls(np.empty(0), np.empty(0), offsets)
+        return cls(
+            np.concatenate([cf.times for cf in cash_flows]),
+            np.concatenate([cf.values for cf in cash_flows]),
+            offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> CashFlow:
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return CashFlow.from_arrays(self.times[start:stop], self.values[start:stop])
+
+    def chunk_bounds(self, points: int) -> np.ndarray:
+        """Flow indices splitting the batch into runs of whole flows with about `points` points each."""
+        starts = np.searchsorted(self.offsets, np.arange(points, self.offsets[-1], max(points, 1)), side="right") - 1
+        return np.unique(np.concatenate([[0], np.minimum(starts, len(self)), [len(self)]]))
+
+    def slice(self, first: int, last: int) -> "CashFlowBatch":
+        """Flows `first:last` as a view."""
+        start, stop = self.offsets[first], self.offsets[last]
+        return CashFlowBatch(self.times[start:stop], self.values[start:stop], self.offsets[first:last + 1] - start)
+
+    def chunks(self, points: int) -> Iterator["CashFlowBatch"]:
+        """
+        Consecutive sub-batches of whole flows with about `points` points each. They are views,
+        so chunking a memory-mapped batch only pages in one chunk at a time.
+        """
+        bounds = self.chunk_bounds(points)
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            yield self.slice(first, last)
+
+    def segment_sum(self, x: np.ndarray) -> np.ndarray:
+        """Sum `x` over the last (flow point) axis within each cash flow."""
+        starts = self.offsets[:-1]
+        nonempty = starts < self.offsets[1:]
+        sums = np.zeros(x.shape[:-1] + (len(self),))
+        if nonempty.any():
+            sums[..., nonempty] = np.add.reduceat(x, starts[nonempty], axis=-1)
+        return sums
+
+    # With `chunk` set, flows are priced `chunk` points at a time, bounding the working set.
+
+    def present_values(self, policy: DiscountContext, chunk: Optional[int] = None) -> np.ndarray:
+        """Present value of every flow; array-valued policy parameters add leading axes."""
+        if chunk is not None:
+            return np.concatenate([part.present_values(policy) for part in self.chunks(chunk)], axis=-1)
+        return self.segment_sum(self.values * policy.discount_factors(self.times))
+
+    def moments(self, policy: DiscountContext, chunk: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Present-value moments of every flow (see `CashFlow.moments`)."""
+        if chunk is not None:
+            parts = [part.moments(policy) for part in self.chunks(chunk)]
+            return tuple(np.concatenate(moment, axis=-1) for moment in zip(*parts))
+        pvs = self.values * policy.discount_factors(self.times)
+        tau = self.times - policy.now.time
+        tau_pvs = tau * pvs
+        return self.segment_sum(pvs), self.segment_sum(tau_pvs), self.segment_sum(tau * tau_pvs)
+
+    def risk(self, policy: DiscountContext, chunk: Optional[int] = None) -> RiskMetrics:
+        """Risk metrics of every flow (as arrays) from a single evaluation of the discount factors."""
+        return RiskMetrics.from_moments(*self.moments(policy, chunk), policy)
+
+    def implicit_rates(
+        self,
+        prices: np.ndarray = 0.0,
+        discount: Callable = yearly_discount,
+        bracket: Tuple[float, float] = (-0.99, 10.0),
+        **kwargs,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Yield of every flow at which its present value equals `prices` (see `CashFlow.implicit_rate`),
+        solved for all flows at once. Returns the yields and a mask of the flows that converged.
+        """
+        kernel = vectorized(discount)
+        m = compounding_frequency(discount, kwargs)
+        lengths = np.diff(self.offsets)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), (len(self),))
+
+        def pv_dpv(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            pvs = self.values * kernel(self.times, 0.0, y=np.repeat(y, lengths), **kwargs)
+            return (
+                self.segment_sum(pvs) - prices,
+                -self.segment_sum(self.times * pvs) / (1 + y / m),
+            )
+
+        return newton_raphson_vectorized(pv_dpv, np.full(len(self), 0.05), *bracket)
@@ -1,11 +1,17 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, Iterator, List, Tuple
 
+import numpy as np
+
+from math_utils.dual import Dual
+from math_utils.newton_raphson import newton_raphson
+from rates.compound import compounding_frequency, yearly_discount
+from rates.day_count import Dates, year_fractions
 from rates.discount_context import DiscountContext
 from rates.time import Time
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     time: Time
     value: float
@@ -14,28 +20,236 @@ class Point:
         return self.value * policy(self.time)
 
 
+@dataclass
+class RiskMetrics:
+    present_value: float
+    duration: float
+    modified_duration: float
+    convexity: float
+
+    @classmethod
+    def from_moments(cls, s0: float, s1: float, s2: float, policy: DiscountContext) -> "RiskMetrics":
+        """
+        Metrics from the present-value moments `s_k = sum((t - now) ** k * pv(t))`.
+        Yield sensitivities follow the compounding frequency `m` of the policy.
+        """
+        growth = 1 + policy.periodic_yield
+        duration = s1 / s0
+        return cls(
+            present_value=s0,
+            duration=duration,
+            modified_duration=duration / growth,
+            convexity=(s2 + s1 / policy.compounding) / growth ** 2 / s0,
+        )
+
+
 @dataclass
 class CashFlow:
-    cash_flow: List[Point]
+    """
+    Cash flow stored as contiguous `times` and `values` arrays.
+    The `List[Point]` form is built on demand by `cash_flow`.
+    """
+    times: np.ndarray = field(compare=False)
+    values: np.ndarray = field(compare=False)
 
     def __init__(self, cash_flow: List[Point]):
         self.cash_flow = cash_flow
 
+    def __eq__(self, other) -> bool:
+        # Array fields are excluded from the generated comparison, so compare them explicitly.
+        if not isinstance(other, CashFlow):
+            return NotImplemented
+        return np.array_equal(self.times, other.times) and np.array_equal(self.values, other.values)
+
+    @classmethod
+    def from_arrays(cls, times: np.ndarray, values: np.ndarray) -> "CashFlow":
+        cash_flow = cls.__new__(cls)
+        CashFlow._set_arrays(cash_flow, times, values)
+        return cash_flow
+
+    @classmethod
+    def from_dates(cls, dates: Dates, values: np.ndarray, reference, convention: str = "ACT/365") -> "CashFlow":
+        """
+        Cash flow of payments on calendar `dates` (dates, datetimes, ISO strings), with times in
+        years from `reference` under the day-count `convention`.
+        """
+        return cls.from_arrays(year_fractions(dates, reference, convention), values)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point], chunk: int = 1 << 16) -> "CashFlow":
+        """
+        Cash flow from any iterable of points (e.g. a generator) in a single pass, copying them
+        into fixed-size buffers so that no list of points is ever held.
+        """
+        times, values = [], []
+        buffer = np.empty((2, chunk))
+        filled = 0
+        for point in points:
+            buffer[0, filled] = point.time.time
+            buffer[1, filled] = point.value
+            filled += 1
+            if filled == chunk:
+                times.append(buffer[0].copy())
+                values.append(buffer[1].copy())
+                filled = 0
+        times.append(buffer[0, :filled])
+        values.append(buffer[1, :filled])
+        return cls.from_arrays(np.concatenate(times), np.concatenate(values))
+
+    def _set_arrays(self, times: np.ndarray, values: np.ndarray):
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self.values = np.ascontiguousarray(values, dtype=float)
+        assert self.times.shape == self.values.shape
+
+    @property
+    def cash_flow(self) -> List[Point]:
+        return [Point(Time(t), v) for t, v in zip(self.times.tolist(), self.values.tolist())]
+
+    @cash_flow.setter
+    def cash_flow(self, cash_flow: List[Point]):
+        n = len(cash_flow)
+        self._set_arrays(
+            np.fromiter((point.time.time for point in cash_flow), dtype=float, count=n),
+            np.fromiter((point.value for point in cash_flow), dtype=float, count=n),
+        )
+
+    def __iter__(self) -> Iterator[Point]:
+        """Points built one at a time, without materializing the whole list."""
+        for t, v in zip(self.times, self.values):
+            yield Point(Time(float(t)), float(v))
+
     def length(self) -> int:
-        return len(self.cash_flow)
+        return len(self.times)
+
+    # Algebra. Results are plain array-backed `CashFlow`s, whatever the operands' types.
+
+    def sorted(self) -> "CashFlow":
+        """This flow with its points in time order (itself if already sorted)."""
+        if np.all(self.times[1:] >= self.times[:-1]):
+            return self
+        order = np.argsort(self.times, kind="stable")
+        return CashFlow.from_arrays(self.times[order], self.values[order])
+
+    def coalesce(self) -> "CashFlow":
+        """Sorted flow with the values at equal times summed into one point."""
+        flow = self.sorted()
+        if len(flow.times) == 0:
+            return CashFlow.from_arrays(flow.times, flow.values)
+        starts = np.flatnonzero(np.concatenate([[True], flow.times[1:] != flow.times[:-1]]))
+        return CashFlow.from_arrays(flow.times[starts], np.add.reduceat(flow.values, starts))
+
+    @staticmethod
+    def combine(cash_flows: Iterable["CashFlow"]) -> "CashFlow":
+        """
+        Sum of any number of flows, coalescing equal times, in one pass. The flows are concatenated
+        and stably sorted: timsort merges the already-sorted runs, so sorted flows cost
+        O(N log k) for k flows of N points in total, and O(n + m) for two.
+        """
+        cash_flows = list(cash_flows)
+        if not cash_flows:
+            return CashFlow.from_arrays(np.empty(0), np.empty(0))
+        times = np.concatenate([cash_flow.times for cash_flow in cash_flows])
+        values = np.concatenate([cash_flow.values for cash_flow in cash_flows])
+        order = np.argsort(times, kind="stable")
+        return CashFlow.from_arrays(times[order], values[order]).coalesce()
+
+    def __add__(self, other: "CashFlow") -> "CashFlow":
+        """Combined flow, coalescing equal times (see `combine`)."""
+        if not isinstance(other, CashFlow):
+            return NotImplemented
+        return CashFlow.combine([self, other])
+
+    def __radd__(self, other) -> "CashFlow":
+        # Lets `sum(cash_flows)` start from 0. `sum` merges pairwise, which is quadratic over a
+        # long ladder: use `CashFlow.combine(cash_flows)` for many flows.
+        if isinstance(other, (int, float)) and other == 0:
+            return CashFlow.from_arrays(self.times, self.values)
+        return NotImplemented
+
+    def __neg__(self) -> "CashFlow":
+        return CashFlow.from_arrays(self.times, -self.values)
+
+    def __sub__(self, other: "CashFlow") -> "CashFlow":
+        """Net flow, e.g. assets minus liabilities."""
+        if not isinstance(other, CashFlow):
+            return NotImplemented
+        return self + (-other)
+
+    def __mul__(self, factor: float) -> "CashFlow":
+        if not np.isscalar(factor):
+            return NotImplemented
+        return CashFlow.from_arrays(self.times, factor * self.values)
+
+    __rmul__ = __mul__
+
+    def shift(self, dt: float) -> "CashFlow":
+        """Flow moved `dt` later in time; the values array is shared, not copied."""
+        return CashFlow.from_arrays(self.times + dt, self.values)
+
+    def window(self, start: float = -np.inf, end: float = np.inf) -> "CashFlow":
+        """Points with `start <= time < end`, as views when the flow is sorted."""
+        flow = self.sorted()
+        lo, hi = np.searchsorted(flow.times, [start, end], side="left")
+        return CashFlow.from_arrays(flow.times[lo:hi], flow.values[lo:hi])
+
+    def _present_values(self, policy: DiscountContext) -> np.ndarray:
+        return self.values * policy.discount_factors(self.times)
+
+    # Array-valued policy parameters (e.g. a vector of yields) give one result per parameter value.
 
     def present_value(self, policy: DiscountContext) -> float:
-        return sum(point.present_value(policy) for point in self.cash_flow)
+        return self._present_values(policy).sum(axis=-1)
+
+    def present_value_derivatives(self, policy: DiscountContext, parameter: str = "y") -> Tuple[float, float, float]:
+        """
+        Present value with its first and second derivatives in the policy parameter `parameter`,
+        from one forward-mode pricing pass. For derivatives in curve nodes, price with a
+        `YieldCurve.seed_nodes()` curve instead: `present_value` then returns a `Dual`.
+        """
+        seed = Dual.variable(policy.kwargs.get(parameter, 0.0))
+        pv = self.present_value(replace(policy, kwargs={**policy.kwargs, parameter: seed}))
+        return pv.value, pv.d1, pv.d2
+
+    def moments(self, policy: DiscountContext) -> Tuple[float, float, float]:
+        """Present-value moments `sum((t - now) ** k * pv(t))` for k = 0, 1, 2."""
+        pvs = self._present_values(policy)
+        tau = self.times - policy.now.time
+        tau_pvs = tau * pvs
+        return pvs.sum(axis=-1), tau_pvs.sum(axis=-1), (tau * tau_pvs).sum(axis=-1)
+
+    def risk(self, policy: DiscountContext) -> "RiskMetrics":
+        """All risk metrics from a single evaluation of the discount factors."""
+        return RiskMetrics.from_moments(*self.moments(policy), policy)
 
     def duration(self, policy: DiscountContext) -> float:
-        return sum(
-            point.time.time * point.present_value(policy) for point in self.cash_flow
-        ) / self.present_value(policy)
+        return self.risk(policy).duration
 
     def modified_duration(self, policy: DiscountContext) -> float:
-        pass
-        # TODO
+        return self.risk(policy).modified_duration
 
     def convexity(self, policy: DiscountContext) -> float:
-        pass
-        # TODO
+        return self.risk(policy).convexity
+
+    def implicit_rate(
+        self,
+        price: float = 0.0,
+        discount: Callable = yearly_discount,
+        bracket: Tuple[float, float] = (-0.99, 10.0),
+        **kwargs,
+    ) -> float:
+        """
+        Yield at which the present value equals `price`: the implicit interest rate for `price=0`,
+        the yield to maturity for a bond's market price.
+        Safeguarded Newton with the analytic yield derivative of the present value.
+        """
+        policy = DiscountContext(discount, kwargs=kwargs)
+        m = compounding_frequency(discount, kwargs)
+
+        def pv(y: float) -> float:
+            return np.dot(self.values, policy.discount_factors(self.times, y=y)) - price
+
+        def dpv(y: float) -> float:
+            pvs = self.values * policy.discount_factors(self.times, y=y)
+            return -np.dot(self.times, pvs) / (1 + y / m)
+
+        return newton_raphson(pv, 0.05, dpv, bracket=bracket)
@@ -0,0 +1,103 @@
+from typing import Tuple
+
+import numpy as np
+
+from math_utils.dual import Dual
+from rates.compound import is_flat
+from rates.discount_context import DiscountContext
+
+# Below this distance from 1 the closed forms cancel (g2 loses about eps / |1 - v| ** 3), and the
+# moments are taken from the derivatives of log g0 instead (see `_near_one_moments`).
+_NEAR_ONE = 0.1
+
+
+def _log_sinhc_derivatives(z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First and second derivatives of `log(sinh(z) / z)`, by their series near 0."""
+    small = np.abs(z) < 0.1
+    s = np.where(small, 1.0, z)
+    z2 = z * z
+    with np.errstate(over="ignore"):
+        tail = 1 / s ** 2 - 1 / np.sinh(s) ** 2
+    first = np.where(
+        small,
+        z * (1 / 3 - z2 * (1 / 45 - z2 * (2 / 945 - z2 * (1 / 4725 - z2 * 2 / 93555)))),
+        1 / np.tanh(s) - 1 / s,
+    )
+    second = np.where(
+        small,
+        1 / 3 - z2 * (1 / 15 - z2 * (2 / 189 - z2 * (1 / 675 - z2 * 2 / 10395))),
+        tail,
+    )
+    return first, second
+
+
+def _near_one_moments(v: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Geometric moments without cancellation for `v` near 1. With `v = exp(x)`,
+    `g0 = exp((n - 1) x / 2) * sinh(n x / 2) / sinh(x / 2)` and `g1`, `g2` are its first two
+    derivatives in `x`: `g0 * L'` and `g0 * (L'' + L' ** 2)` for `L = log g0`.
+    """
+    x = np.log(v)
+    safe = np.where(x == 0, 1.0, x)
+    g0 = np.where(x == 0, n, np.expm1(n * x) / np.expm1(safe))
+    first_n, second_n = _log_sinhc_derivatives(n * x / 2)
+    first_1, second_1 = _log_sinhc_derivatives(x / 2)
+    d1 = (n - 1) / 2 + (n * first_n - first_1) / 2
+    d2 = (n * n * second_n - second_1) / 4
+    return g0, g0 * d1, g0 * (d2 + d1 * d1)
+
+
+def geometric_moments(v: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closed forms of `sum(k ** j * v ** k for k in range(n))` for j = 0, 1, 2.
+    `v` and `n` broadcast; `n` may be `np.inf` when every `|v| < 1`.
+    """
+    v = np.asarray(v, dtype=float)
+    if np.all(np.isinf(n)):
+        g0 = 1 / (1 - v)
+        return g0, v * g0 ** 2, v * (1 + v) * g0 ** 3
+
+    v, n = np.broadcast_arrays(v, np.asarray(n, dtype=float))
+    shape, v, n = v.shape, v.reshape(-1), n.reshape(-1)
+    near = np.abs(1 - v) < _NEAR_ONE
+    w = np.where(near, 0.5, v)
+    vn, vn1 = w ** n, w ** (n - 1)
+    g0 = (1 - vn) / (1 - w)
+    g1 = w * (1 - n * vn1 + (n - 1) * vn) / (1 - w) ** 2
+    g2 = w * (1 + w - n ** 2 * vn1 + (2 * n ** 2 - 2 * n - 1) * vn - (n - 1) ** 2 * vn * w) / (1 - w) ** 3
+
+    if near.any():
+        g0[near], g1[near], g2[near] = _near_one_moments(v[near], n[near])
+    return g0.reshape(shape), g1.reshape(shape), g2.reshape(shape)
+
+
+def closed_form_applies(policy: DiscountContext) -> bool:
+    """Whether `policy` discounts geometrically (a flat kernel) with plain numeric parameters."""
+    return is_flat(policy.discount) and not any(isinstance(v, Dual) for v in policy.kwargs.values())
+
+
+def stream_moments(
+    policy: DiscountContext,
+    payment: float,
+    periods: float,
+    m: int,
+    growth: float = 0.0,
+    start: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Present-value moments (see `CashFlow.moments`) of payments `payment * (1 + growth) ** k` at
+    `start + k / m`, k < `periods`, under a flat `policy`: the discounted payment `k` is
+    `payment * base * r ** k`, with `base` the factor at `start` and `r` the growth times the
+    one-period factor. Infinite streams are worth `inf` unless `r < 1`.
+    """
+    factors = policy.discount_factors(np.array([start, start + 1 / m]))
+    base = factors[..., 0]
+    r = (1 + growth) * factors[..., 1] / base
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g0, g1, g2 = geometric_moments(r, periods)
+    if np.isinf(periods):
+        g0, g1, g2 = (np.where(r < 1, g, np.inf) for g in (g0, g1, g2))
+    k0, k1, k2 = (payment * base * g for g in (g0, g1, g2))
+    # Shift the moments from k to tau = start + k / m - now.
+    offset = start - policy.now.time
+    return k0, k1 / m + offset * k0, k2 / m ** 2 + 2 * offset * k1 / m + offset ** 2 * k0
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from rates.discount_context import DiscountContext
+
+
+@dataclass
+class ContingentAnnuity:
+    """
+    Payments at sorted `times` that stop at a random event (death, default).
+    `probabilities[k]` is the probability that exactly the first `k` payments are made,
+    for k = 0, ..., n; they must sum to 1.
+
+    Every metric comes from one cumulative sum of discounted payments: the present value
+    given that exactly `k` payments are made. Array-valued policy parameters (e.g. rate
+    scenarios) add leading axes to the results.
+    """
+    times: np.ndarray
+    payments: np.ndarray
+    probabilities: np.ndarray
+
+    def __post_init__(self):
+        self.times = np.asarray(self.times, dtype=float)
+        self.payments = np.broadcast_to(np.asarray(self.payments, dtype=float), self.times.shape)
+        self.probabilities = np.asarray(self.probabilities, dtype=float)
+        assert self.probabilities.shape == (len(self.times) + 1,)
+        assert abs(self.probabilities.sum() - 1) < 1e-9
+
+    @classmethod
+    def from_survival(cls, times: np.ndarray, payments: np.ndarray, survival: np.ndarray) -> "ContingentAnnuity":
+        """From `survival[k]`, the probability that payment `k` is made (non-increasing)."""
+        survival = np.concatenate([[1.0], np.asarray(survival, dtype=float)])
+        return cls(times, payments, np.append(-np.diff(survival), survival[-1]))
+
+    def _discounted(self, policy: DiscountContext) -> np.ndarray:
+        return self.payments * policy.discount_factors(self.times)
+
+    @staticmethod
+    def _cumulative(discounted: np.ndarray) -> np.ndarray:
+        """Running sums over the payments, starting from 0 payments made."""
+        cumulative = np.zeros(discounted.shape[:-1] + (discounted.shape[-1] + 1,))
+        np.cumsum(discounted, axis=-1, out=cumulative[..., 1:])
+        return cumulative
+
+    def present_values_by_count(self, policy: DiscountContext) -> np.ndarray:
+        """Present value given that exactly `k` payments are made, for k = 0, ..., n."""
+        return self._cumulative(self._discounted(policy))
+
+    def expected_present_value(self, policy: DiscountContext) -> float:
+        return self.present_values_by_count(policy) @ self.probabilities
+
+    def variance(self, policy: DiscountContext) -> float:
+        cumulative = self.present_values_by_count(policy)
+        mean = cumulative @ self.probabilities
+        return cumulative ** 2 @ self.probabilities - mean ** 2
+
+    def duration(self, policy: DiscountContext) -> float:
+        """Expected-PV-weighted time to the payments."""
+        discounted = self._discounted(policy)
+        timed = self._cumulative((self.times - policy.now.time) * discounted)
+        return (timed @ self.probabilities) / (self._cumulative(discounted) @ self.probabilities)
@@ -0,0 +1,67 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow
+
+# A universe is a directory of column files: `times.npy` and `values.npy` hold every flow end to
+# end, `offsets.npy` delimits the flows (as in `CashFlowBatch`) and `names.json` names them.
+COLUMNS = ("times", "values", "offsets")
+NAMES = "names.json"
+
+
+@dataclass
+class Universe:
+    """Instruments opened from disk: their packed cash flows and their names."""
+    batch: CashFlowBatch
+    names: List[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def __getitem__(self, i: int) -> CashFlow:
+        return self.batch[i]
+
+
+def write_universe(path: str, instruments: Sequence[CashFlow]) -> None:
+    """
+    Store `instruments` (cash flows, assets, bonds) in column files under `path`.
+    Columns are written through memory maps one instrument at a time, so the universe is never
+    held in memory as a whole.
+    """
+    os.makedirs(path, exist_ok=True)
+    offsets = np.zeros(len(instruments) + 1, dtype=np.int64)
+    np.cumsum(
+        np.fromiter((instrument.length() for instrument in instruments), dtype=np.int64, count=len(instruments)),
+        out=offsets[1:],
+    )
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+
+    columns = {
+        column: np.lib.format.open_memmap(os.path.join(path, f"{column}.npy"), "w+", float, (int(offsets[-1]),))
+        for column in ("times", "values")
+    }
+    for instrument, start, stop in zip(instruments, offsets[:-1], offsets[1:]):
+        columns["times"][start:stop] = instrument.times
+        columns["values"][start:stop] = instrument.values
+    for column in columns.values():
+        column.flush()
+
+    with open(os.path.join(path, NAMES), "w") as f:
+        json.dump([getattr(instrument, "name", None) for instrument in instruments], f)
+
+
+def open_universe(path: str, mmap_mode: Optional[str] = "r") -> Universe:
+    """
+    Universe stored under `path`, memory-mapped by default: opening it reads no cash flow, and
+    pricing pages in only the points it touches (use `chunk` in `CashFlowBatch` pricing to bound
+    the working set).
+    """
+    times, values, offsets = (np.load(os.path.join(path, f"{column}.npy"), mmap_mode=mmap_mode) for column in COLUMNS)
+    with open(os.path.join(path, NAMES)) as f:
+        names = json.load(f)
+    return Universe(CashFlowBatch(times, values, offsets), names)
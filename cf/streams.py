@@ -0,0 +1,114 @@
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from cf.cash_flow import CashFlow, Point
+from cf.closed_form import closed_form_applies, stream_moments
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+# Points generated at once when a stream has to be priced point by point.
+STREAM_CHUNK = 4096
+
+
+@dataclass(repr=False)
+class GeometricStream(CashFlow):
+    """
+    Payments `payment * (1 + growth) ** k` at times `start + k / m`, for k = 0, ..., periods - 1.
+    `periods` may be `math.inf`. Nothing is stored per point: iterating generates the points,
+    and under flat discounting pricing and risk use closed-form geometric sums. Other discount
+    sources price finite streams `STREAM_CHUNK` points at a time.
+
+    Infinite streams have no explicit `times`/`values`, so they cannot join a `Portfolio`
+    (whose metrics run on a merged grid); price them on their own.
+    """
+    payment: float
+    periods: float
+    m: int
+    growth: float
+    start: float
+
+    def __init__(self, payment: float, periods: float, m: int = 1, growth: float = 0.0, start: Optional[float] = None):
+        self.payment = payment
+        self.periods = periods
+        self.m = m
+        self.growth = growth
+        # Payments in arrears by default: the first one is one period from time 0.
+        self.start = 1 / m if start is None else start
+
+    def __repr__(self) -> str:
+        return (
+            f"GeometricStream(payment={self.payment}, periods={self.periods}, m={self.m}, "
+            f"growth={self.growth}, start={self.start})"
+        )
+
+    def _points(self, first: int, last: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = np.arange(first, last)
+        return self.start + k / self.m, self.payment * (1 + self.growth) ** k
+
+    def _finite(self):
+        if math.isinf(self.periods):
+            raise ValueError("An infinite stream has no explicit schedule")
+
+    @property
+    def times(self) -> np.ndarray:
+        self._finite()
+        return self._points(0, int(self.periods))[0]
+
+    @property
+    def values(self) -> np.ndarray:
+        self._finite()
+        return self._points(0, int(self.periods))[1]
+
+    def __iter__(self) -> Iterator[Point]:
+        counter = itertools.count() if math.isinf(self.periods) else range(int(self.periods))
+        for k in counter:
+            yield Point(Time(self.start + k / self.m), self.payment * (1 + self.growth) ** k)
+
+    def length(self) -> float:
+        return self.periods
+
+    def _chunked_moments(self, policy: DiscountContext) -> Tuple[float, float, float]:
+        self._finite()
+        total = (0.0, 0.0, 0.0)
+        for first in range(0, int(self.periods), STREAM_CHUNK):
+            chunk = CashFlow.from_arrays(*self._points(first, min(first + STREAM_CHUNK, int(self.periods))))
+            total = tuple(a + b for a, b in zip(total, chunk.moments(policy)))
+        return total
+
+    def present_value(self, policy: DiscountContext) -> float:
+        return self.moments(policy)[0]
+
+    def moments(self, policy: DiscountContext) -> Tuple[float, float, float]:
+        if closed_form_applies(policy):
+            return stream_moments(policy, self.payment, self.periods, self.m, self.growth, self.start)
+        return self._chunked_moments(policy)
+
+
+def annuity(payment: float, periods: int, m: int = 1, start: Optional[float] = None) -> GeometricStream:
+    return GeometricStream(payment, periods, m, 0.0, start)
+
+
+def perpetuity(payment: float, m: int = 1, start: Optional[float] = None) -> GeometricStream:
+    return GeometricStream(payment, math.inf, m, 0.0, start)
+
+
+def growing_annuity(payment: float, growth: float, periods: int, m: int = 1, start: Optional[float] = None) -> GeometricStream:
+    """`growth` is the rate per payment period."""
+    return GeometricStream(payment, periods, m, growth, start)
+
+
+def growing_perpetuity(payment: float, growth: float, m: int = 1, start: Optional[float] = None) -> GeometricStream:
+    """`growth` is the rate per payment period."""
+    return GeometricStream(payment, math.inf, m, growth, start)
+
+
+if __name__ == "__main__":
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+    print(perpetuity(100).present_value(policy))
+    print(growing_perpetuity(100, 0.02).present_value(policy))
+    print(annuity(100, 1200, m=12).risk(policy))
@@ -2,11 +2,12 @@ import math
 from typing import Callable
 
 from bonds.bonds import Bond
-from cf.cash_flow import CashFlow, Point
+from cf.amortization import level_payment
+from cf.cash_flow import Point
+from cf.contingent import ContingentAnnuity
 from investing.asset import Asset
 from investing.immunization import immunize
 from investing.portfolio import Portfolio
-from math_utils.newton_raphson import bisect
 from rates.compound import yearly_discount
 from rates.discount_context import DiscountContext
 from rates.time import Time
@@ -15,12 +16,7 @@ from rates.time import Time
 total_debt = 25000
 periods = 7 * 12
 interest_rate = .07
-ans = 12 * bisect(
-    lambda r: CashFlow([
-        Point(Time((i + 1) / 12), r) for i in range(periods)
-    ]).present_value(DiscountContext(yearly_discount, kwargs={"y": interest_rate})) - total_debt,
-    0, 100000, 10 ** (-9)
-)
+ans = 12 * level_payment(total_debt, interest_rate, periods, 12)
 print(f"Monthly payments = $ {ans:.4f}")
 
 # Exercise 3: Uncertain annuity
@@ -35,9 +31,15 @@ print(f"Life expectancy = {life_expectancy:.2f} years")
 annual_payment = 10000
 interest_rate = .08
 
+# Dying at ages[k] means receiving the first k payments.
+annuity = ContingentAnnuity(
+    [a + 1 for a in ages[:-1]], annual_payment, probs
+)
+annuity_policy = DiscountContext(yearly_discount, now=Time(current_age), kwargs={"y": interest_rate})
+present_values_by_age = annuity.present_values_by_count(annuity_policy)
+
 def present_value_till_age(age: int) -> float:
-    cf = CashFlow([Point(Time(a + 1), annual_payment) for a in range(current_age, age)])
-    return cf.present_value(DiscountContext(yearly_discount, now=Time(current_age), kwargs={"y": interest_rate}))
+    return present_values_by_age[age - current_age]
 
 def int_average(t: float, fn: Callable[int, float]) -> float:
     if t == math.floor(t):
@@ -50,11 +52,9 @@ def int_average(t: float, fn: Callable[int, float]) -> float:
 expected_present_value = int_average(life_expectancy, present_value_till_age)
 print(f"Expected present value = $ {expected_present_value:.2f}")
 
-expected_present_value = sum(
-    present_value_till_age(age) * prob
-    for age, prob in zip(ages, probs)
-)
+expected_present_value = annuity.expected_present_value(annuity_policy)
 print(f"Expected present value = $ {expected_present_value:.2f}")
+print(f"Standard deviation = $ {math.sqrt(annuity.variance(annuity_policy)):.2f}")
 
 # Exercise 9
 bond = Bond(0.08, 100, 10, 1, "10y 8% Bond")
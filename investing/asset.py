@@ -4,10 +4,15 @@ from typing import List
 from cf.cash_flow import CashFlow, Point
 
 
-@dataclass
+@dataclass(eq=False)
 class Asset(CashFlow):
     name: str
 
     def __init__(self, cash_flow: List[Point], name: str):
         super().__init__(cash_flow)
         self.name = name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Asset):
+            return NotImplemented
+        return self.name == other.name and super().__eq__(other)
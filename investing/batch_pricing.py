@@ -0,0 +1,132 @@
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from bonds.bonds import Bond, pack_bonds
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow, RiskMetrics
+from investing.portfolio import Portfolio
+from rates.discount_context import DiscountContext
+
+# Rows of the shared result matrix, one column per instrument.
+METRICS = ("present_value", "duration", "modified_duration", "convexity")
+
+
+@dataclass
+class SharedArray:
+    """Picklable handle to an array living in a shared memory block."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> Tuple["SharedArray", SharedMemory]:
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        handle = cls(block.name, array.shape, array.dtype.str)
+        handle.view(block)[...] = array
+        return handle, block
+
+    def view(self, block: SharedMemory) -> np.ndarray:
+        return np.ndarray(self.shape, np.dtype(self.dtype), buffer=block.buf)
+
+
+# Per-process state set once by `_attach`: the policy and views of the shared blocks.
+_worker: Dict[str, object] = {}
+
+
+def _attach(handles: Dict[str, SharedArray], policy: DiscountContext):
+    blocks = {key: SharedMemory(name=handle.name) for key, handle in handles.items()}
+    _worker.update(
+        policy=policy,
+        blocks=blocks,
+        batch=CashFlowBatch(*(handles[key].view(blocks[key]) for key in ("times", "values", "offsets"))),
+        results=handles["results"].view(blocks["results"]),
+    )
+
+
+def _price_range(bounds: Tuple[int, int]) -> Tuple[int, int]:
+    """Price flows `first:last` of the shared batch into the shared results; only the bounds travel."""
+    first, last = bounds
+    risk = _worker["batch"].slice(first, last).risk(_worker["policy"])
+    for row, metric in enumerate(METRICS):
+        _worker["results"][row, first:last] = getattr(risk, metric)
+    return first, last
+
+
+def pack(instruments: Sequence[Union[CashFlow, Portfolio]]) -> CashFlowBatch:
+    """Packed schedules of a book; an all-bond book is packed from the bond specs in bulk."""
+    if all(isinstance(instrument, Bond) for instrument in instruments):
+        return pack_bonds(instruments)
+    return CashFlowBatch.from_cash_flows(instruments)
+
+
+def price_stream(
+    instruments: Sequence[Union[CashFlow, Portfolio]],
+    policy: DiscountContext,
+    chunk_points: int = 1 << 16,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[slice, RiskMetrics]]:
+    """
+    Price a book across a process pool, yielding `(instruments slice, RiskMetrics of arrays)`
+    as chunks complete, in completion order.
+
+    The book is packed once into shared memory, and each worker receives the packed arrays'
+    handles and the policy (curve included) once, at start-up. Tasks are flow ranges of about
+    `chunk_points` points and workers write their metrics straight into a shared result block,
+    so nothing is pickled per instrument. `workers=0` prices in this process.
+    """
+    batch = pack(instruments)
+    bounds = batch.chunk_bounds(chunk_points)
+    tasks = [(int(first), int(last)) for first, last in zip(bounds[:-1], bounds[1:])]
+
+    arrays = {
+        "times": batch.times,
+        "values": batch.values,
+        "offsets": batch.offsets,
+        "results": np.zeros((len(METRICS), len(batch))),
+    }
+    blocks: List[SharedMemory] = []
+    handles = {}
+    try:
+        for key, array in arrays.items():
+            handles[key], block = SharedArray.create(array)
+            blocks.append(block)
+        results = handles["results"].view(blocks[-1])
+
+        def collect(first: int, last: int) -> Tuple[slice, RiskMetrics]:
+            return slice(first, last), RiskMetrics(*(results[row, first:last].copy() for row in range(len(METRICS))))
+
+        if workers == 0:
+            _attach(handles, policy)
+            try:
+                for task in tasks:
+                    yield collect(*_price_range(task))
+            finally:
+                for block in _worker.pop("blocks").values():
+                    block.close()
+                _worker.clear()
+        else:
+            with multiprocessing.Pool(workers, initializer=_attach, initargs=(handles, policy)) as pool:
+                for first, last in pool.imap_unordered(_price_range, tasks):
+                    yield collect(first, last)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def price_book(
+    instruments: Sequence[Union[CashFlow, Portfolio]],
+    policy: DiscountContext,
+    chunk_points: int = 1 << 16,
+    workers: Optional[int] = None,
+) -> RiskMetrics:
+    """Metrics of every instrument, as arrays in the order of `instruments` (see `price_stream`)."""
+    metrics = np.empty((len(METRICS), len(instruments)))
+    for chunk, risk in price_stream(instruments, policy, chunk_points, workers):
+        for row, metric in enumerate(METRICS):
+            metrics[row, chunk] = getattr(risk, metric)
+    return RiskMetrics(*metrics)
@@ -0,0 +1,74 @@
+from typing import List, Optional, Union
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix, diags, hstack
+
+from cf.batch import CashFlowBatch
+from investing.asset import Asset
+from investing.lots import lot_sizes, solve_in_lots
+from investing.portfolio import Portfolio
+from rates.discount_context import DiscountContext
+
+
+def dedicate(
+    portfolio: Portfolio,
+    available_assets: List[Asset],
+    policy: DiscountContext,
+    reinvestment: Optional[DiscountContext] = None,
+    lot_size: Optional[Union[float, np.ndarray]] = 1,
+    candidates: int = 64,
+    mip_gap: float = 1e-3,
+) -> np.ndarray:
+    """
+    Cash-flow matching: the minimum-cost set of assets whose flows pay every liability of the
+    portfolio (its net negative flows) on or before its date. Purchased quantities are added to the
+    portfolio as positions and returned. Assets are priced with `policy`. As in `immunize`,
+    quantities are non-negative multiples of `lot_size` (per asset, or None for continuous amounts).
+
+    Liability dates form a grid of buckets; every asset flow lands in the first bucket at or
+    after its time (flows after the last liability are ignored). Surplus cash is carried to the
+    next date, grown by `reinvestment` (no interest by default):
+        sum_i q_i * a_ij + growth_j * s_{j-1} - s_j = L_j,   q, s >= 0.
+    The constraint matrix is built sparse, with one row per liability date. With lot sizes, the
+    integer problem is restricted as in `immunize` (LP support plus `candidates` assets) and
+    solved to within `mip_gap` of its optimal cost.
+    """
+    grid = portfolio.as_cash_flow()
+    dates, liabilities = grid.times, -grid.values
+    n_dates, n_assets = len(dates), len(available_assets)
+
+    batch = CashFlowBatch.from_cash_flows(available_assets)
+    buckets = np.searchsorted(dates, batch.times, side="left")
+    owner = np.repeat(np.arange(n_assets), np.diff(batch.offsets))
+    inside = buckets < n_dates
+    flows = coo_matrix(
+        (batch.values[inside], (buckets[inside], owner[inside])), shape=(n_dates, n_assets)
+    ).tocsr()
+
+    growth = np.ones(max(n_dates - 1, 0))
+    if reinvestment is not None:
+        growth = reinvestment.discount_factors(dates[:-1]) / reinvestment.discount_factors(dates[1:])
+    carry = diags([-np.ones(n_dates), growth], [0, -1], shape=(n_dates, n_dates))
+
+    prices = batch.present_values(policy)
+    lots = lot_sizes(lot_size, n_assets)
+    cost = np.concatenate([prices * lots, np.zeros(n_dates)])
+    A = hstack([flows.multiply(lots).tocsr(), carry]).tocsr()
+    relaxed = linprog(cost, A_eq=A, b_eq=liabilities, bounds=(0, None), method="highs")
+    if relaxed.x is None:
+        raise ValueError(f"The liabilities cannot be matched with the available assets: {relaxed.message}")
+    units = relaxed.x[:n_assets]
+
+    if lot_size is not None:
+        integer = np.concatenate([np.ones(n_assets, dtype=bool), np.zeros(n_dates, dtype=bool)])
+        x, message = solve_in_lots(cost, A, liabilities, liabilities, integer, relaxed, candidates, mip_gap)
+        if x is None:
+            raise ValueError(f"No matching portfolio in whole lots: {message}")
+        units = x[:n_assets]
+
+    amounts = units * lots
+    for asset, amount in zip(available_assets, amounts):
+        if amount > 0:
+            portfolio.add(asset, amount)
+    return amounts
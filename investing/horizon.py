@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import Callable, Sequence, Tuple, Union
+
+import numpy as np
+
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow, RiskMetrics
+from investing.portfolio import Portfolio
+from rates.compound import vectorized, yearly_discount
+from rates.discount_context import DiscountContext
+
+# Scenario cells (yields x dates x flow points) evaluated at once, bounding the working set.
+SCENARIO_BUDGET = 1 << 22
+
+
+@dataclass
+class ScenarioGrid:
+    """Metrics of shape `(assets, yields, dates)`."""
+    yields: np.ndarray
+    dates: np.ndarray
+    present_value: np.ndarray
+    duration: np.ndarray
+    modified_duration: np.ndarray
+    convexity: np.ndarray
+
+
+def _moments(
+    batch: CashFlowBatch, kernel: Callable, yields: np.ndarray, dates: np.ndarray, kwargs: dict,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Present-value moments of shape (yields, dates, flows); the kernel broadcasts over all three."""
+    tau = batch.times - dates[:, None]
+    pvs = batch.values * kernel(batch.times, dates[:, None], y=yields[:, None, None], **kwargs)
+    tau_pvs = tau * pvs
+    return batch.segment_sum(pvs), batch.segment_sum(tau_pvs), batch.segment_sum(tau * tau_pvs)
+
+
+def scenario_grid(
+    assets: Sequence[Union[CashFlow, Portfolio]],
+    yields: np.ndarray,
+    dates: np.ndarray,
+    discount: Callable = yearly_discount,
+    **kwargs,
+) -> ScenarioGrid:
+    """
+    Value and risk of every asset for every (yield, valuation date) pair in one broadcasted
+    evaluation: the vector kernel of `discount` gets the yields and the valuation dates as
+    leading axes, and the flows are priced in chunks of at most `SCENARIO_BUDGET` cells.
+    As with `CashFlow.present_value`, points before a valuation date are carried forward to it
+    at the scenario yield. `discount` must have a vectorized kernel (a flat kernel or a `YieldCurve`).
+    """
+    kernel = vectorized(discount)
+    if kernel is None:
+        raise ValueError("Scenario grids need a discount with a vectorized kernel")
+    yields, dates = np.asarray(yields, dtype=float), np.asarray(dates, dtype=float)
+    batch = CashFlowBatch.from_cash_flows(assets)
+    chunk = max(1, SCENARIO_BUDGET // max(1, yields.size * dates.size))
+    parts = [_moments(part, kernel, yields, dates, kwargs) for part in batch.chunks(chunk)]
+    moments = (np.concatenate(moment, axis=-1) for moment in zip(*parts))
+    # Yield sensitivities only need the yields and the compounding of the policy.
+    risk = RiskMetrics.from_moments(*moments, DiscountContext(discount, kwargs={**kwargs, "y": yields[:, None, None]}))
+    return ScenarioGrid(
+        yields=yields,
+        dates=dates,
+        present_value=np.moveaxis(risk.present_value, -1, 0),
+        duration=np.moveaxis(risk.duration, -1, 0),
+        modified_duration=np.moveaxis(risk.modified_duration, -1, 0),
+        convexity=np.moveaxis(risk.convexity, -1, 0),
+    )
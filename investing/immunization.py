@@ -1,35 +1,71 @@
-from typing import List
+from typing import List, Optional, Union
 
 import numpy as np
+from scipy.optimize import linprog
 
+from cf.batch import CashFlowBatch
 from investing.asset import Asset
+from investing.lots import lot_sizes, solve_in_lots
 from investing.portfolio import Portfolio
 from rates.discount_context import DiscountContext
 
 
+def _relaxation(cost: np.ndarray, A: np.ndarray, lower: np.ndarray, upper: np.ndarray):
+    finite = np.isfinite(upper)
+    return linprog(
+        cost,
+        A_ub=np.vstack([-A, A[finite]]),
+        b_ub=np.concatenate([-lower, upper[finite]]),
+        bounds=(0, None),
+        method="highs",
+    )
+
+
 def immunize(
     portfolio: Portfolio,
     available_assets: List[Asset],
     policy: DiscountContext,
-):
+    lot_size: Optional[Union[float, np.ndarray]] = 1,
+    duration_tolerance: float = 0.01,
+    match_convexity: bool = True,
+    candidates: int = 64,
+    mip_gap: float = 1e-3,
+) -> np.ndarray:
     """
-    Immunize the portfolio to the given yield rate.
-    Naively implemented for integer solutions.
+    Immunize the portfolio to the given yield rate at minimum cost, and add the purchased
+    quantities to it as positions. Returns the quantity bought of each asset.
+
+    In terms of present-value moments (see `CashFlow.moments`), the assets bought must
+    - cover the present value of the liabilities,
+    - match their first moment, i.e. their duration, within `duration_tolerance` years,
+    - have at least their second moment (Redington convexity), if `match_convexity`.
+    Quantities are non-negative multiples of `lot_size` (per asset, or None for continuous amounts).
+
+    The LP has one row per condition whatever the number of assets. With lot sizes, the integer
+    problem is solved over the LP support plus the `candidates` assets of lowest reduced cost,
+    to within `mip_gap` of its optimal cost (see `investing.lots.solve_in_lots`).
     """
-    target_pv = -portfolio.present_value(policy)
-    target_duration = portfolio.duration(policy)
+    l0, l1, l2 = (-m for m in portfolio.moments(policy))
+    m0, m1, m2 = CashFlowBatch.from_cash_flows(available_assets).moments(policy)
 
-    pvs = np.array([a.present_value(policy) for a in available_assets])
-    durations = np.array([a.duration(policy) for a in available_assets])
+    lots = lot_sizes(lot_size, len(m0))
+    A = np.vstack([m0, m1, m2] if match_convexity else [m0, m1]) * lots
+    lower = np.array([l0, l1 - duration_tolerance * abs(l0), l2][:len(A)])
+    upper = np.array([np.inf, l1 + duration_tolerance * abs(l0), np.inf][:len(A)])
+    cost = m0 * lots
 
-    # System: sum(amount_i * pv_i) = target_pv
-    #         sum(amount_i * pv_i * duration_i) = target_duration * target_pv
-    A = np.vstack([pvs, pvs * durations])
-    b = np.array([target_pv, target_duration * target_pv])
+    relaxed = _relaxation(cost, A, lower, upper)
+    if relaxed.x is None:
+        raise ValueError(f"Immunization is infeasible with the available assets: {relaxed.message}")
+    units = relaxed.x
 
-    amounts, *_ = np.linalg.lstsq(A, b, rcond=None)
-    amounts = np.round(amounts)
+    if lot_size is not None:
+        units, message = solve_in_lots(cost, A, lower, upper, np.ones(len(m0), dtype=bool), relaxed, candidates, mip_gap)
+        if units is None:
+            raise ValueError(f"No immunizing portfolio in whole lots: {message}")
 
+    amounts = units * lots
     for asset, amount in zip(available_assets, amounts):
-        for _ in range(int(amount)):
-            portfolio.assets.append(asset)
+        if amount > 0:
+            portfolio.add(asset, amount)
+    return amounts
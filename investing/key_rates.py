@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from cf.batch import CashFlowBatch
+from rates.discount_context import DiscountContext
+
+BASIS_POINT = 1e-4
+
+
+@dataclass
+class KeyRateSensitivities:
+    """Rows are instruments, columns are key tenors."""
+    tenors: np.ndarray
+    present_value: np.ndarray
+    durations: np.ndarray
+    dv01: np.ndarray
+
+
+def key_rate_weights(tenors: np.ndarray, tau: np.ndarray) -> np.ndarray:
+    """
+    Triangular bump profiles, shape `(len(tenors), len(tau))`: each key rate moves the zero
+    curve fully at its tenor and linearly less towards its neighbours. The first and last
+    profiles extend flat beyond the ends, so the profiles add up to a parallel shift.
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    weights = np.empty((len(tenors), len(tau)))
+    for k, tenor in enumerate(tenors):
+        left = tenors[k - 1] if k > 0 else -np.inf
+        right = tenors[k + 1] if k + 1 < len(tenors) else np.inf
+        rising = np.clip((tau - left) / (tenor - left), 0, 1) if k > 0 else (tau <= tenor) * 1.0
+        falling = np.clip((right - tau) / (right - tenor), 0, 1) if k + 1 < len(tenors) else (tau >= tenor) * 1.0
+        weights[k] = np.where(tau <= tenor, rising, falling)
+    return weights
+
+
+def key_rate_durations(
+    instruments: Sequence,
+    policy: DiscountContext,
+    tenors: np.ndarray,
+    bump: float = BASIS_POINT,
+) -> KeyRateSensitivities:
+    """
+    Key-rate durations and DV01 per key tenor of each instrument (a `CashFlow`, `Bond` or
+    `Portfolio`), for bumps of the continuously compounded zero rates under `policy`.
+
+    The base discount factors are evaluated once; the 2 x len(tenors) bumped curves are
+    applied to them as one stacked array and differenced centrally.
+    """
+    batch = CashFlowBatch.from_cash_flows(instruments)
+    tau = batch.times - policy.now.time
+    base = batch.values * policy.discount_factors(batch.times)
+    shifts = np.exp(-bump * key_rate_weights(tenors, tau) * tau)
+    bumped = batch.segment_sum(base * np.stack([shifts, 1 / shifts]))
+
+    present_value = batch.segment_sum(base)
+    change = (bumped[1] - bumped[0]).T / 2
+    return KeyRateSensitivities(
+        tenors=np.asarray(tenors, dtype=float),
+        present_value=present_value,
+        durations=change / (present_value[:, None] * bump),
+        dv01=change * BASIS_POINT / bump,
+    )
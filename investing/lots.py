@@ -0,0 +1,54 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, OptimizeResult, milp
+
+# Buying assets in whole lots: the LP relaxation is solved over every asset, then the integer
+# problem only over the assets that can plausibly enter the optimum.
+
+
+def lot_sizes(lot_size: Optional[Union[float, np.ndarray]], n_assets: int) -> np.ndarray:
+    """Lot size of each asset; continuous amounts (`None`) are lots of 1."""
+    if lot_size is None:
+        return np.ones(n_assets)
+    return np.broadcast_to(np.asarray(lot_size, dtype=float), (n_assets,))
+
+
+def solve_in_lots(
+    cost: np.ndarray,
+    A,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    integer: np.ndarray,
+    relaxed: OptimizeResult,
+    candidates: int = 64,
+    mip_gap: float = 1e-3,
+    time_limit: float = 60.0,
+) -> Tuple[Optional[np.ndarray], str]:
+    """
+    Integer solution of `min cost @ x` subject to `lower <= A @ x <= upper`, `x >= 0`, with
+    integer variables where `integer` is set, given the relaxed solution `relaxed` (from HiGHS).
+
+    The MILP keeps the relaxation's support, every continuous variable and the `candidates`
+    integer variables of lowest reduced cost; the others stay at 0. Its size then depends on
+    `candidates`, not on the number of assets. Branch and bound stops once the cost is proven
+    within `mip_gap` (relative) of the optimum, or at `time_limit` seconds with the best solution
+    found: lot problems with many near-equivalent assets are slow to prove optimal. Returns the
+    full solution (None if none was found) and the solver message.
+    """
+    integer_vars = np.flatnonzero(integer)
+    cheapest = integer_vars[np.argsort(relaxed.lower.marginals[integer_vars])[:candidates]]
+    chosen = np.union1d(np.union1d(np.flatnonzero(relaxed.x > 0), np.flatnonzero(~integer)), cheapest)
+    A = A.tocsc()[:, chosen] if hasattr(A, "tocsc") else A[:, chosen]
+    result = milp(
+        c=cost[chosen],
+        constraints=LinearConstraint(A, lower, upper),
+        integrality=integer[chosen].astype(float),
+        bounds=Bounds(0, np.inf),
+        options={"mip_rel_gap": mip_gap, "time_limit": time_limit},
+    )
+    if result.x is None:
+        return None, result.message
+    x = np.zeros(len(cost))
+    x[chosen] = np.where(integer[chosen], np.round(result.x), result.x)
+    return x, result.message
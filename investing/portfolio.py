@@ -1,31 +1,150 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from cf.cash_flow import CashFlow, RiskMetrics
 from investing.asset import Asset
 from rates.discount_context import DiscountContext
 
 
+@dataclass(frozen=True)
+class Position:
+    asset: Asset
+    quantity: float = 1.0
+
+
 @dataclass
 class Portfolio:
-    assets: List[Asset]
+    """
+    Positions of (asset, quantity). Metrics are computed on a merged grid: one cash flow with
+    the sorted distinct times of all assets and their quantity-weighted values.
+
+    Under a policy passed to `track`, the present-value moments (PV, PV x t, PV x t^2) are also
+    kept as running sums: `add`/`remove` update them from the changed asset alone, and metrics
+    under that policy read them directly. They are rebuilt if the tracked policy changes.
+
+    Holdings only change through `add`/`remove`: `positions` and `assets` are read-only
+    snapshots, so that the merged grid and the running moments never go stale. Each change bumps
+    `version`, which caches outside the portfolio (e.g. price surrogates) compare against.
+    """
+    _positions: List[Position]
 
     def __init__(self, assets: List[Asset]):
-        self.assets = assets
+        self._positions = []
+        self.version = 0
+        self._index: Dict[int, int] = {}
+        self._grid: Optional[CashFlow] = None
+        self._tracked: Optional[DiscountContext] = None
+        self._tracked_key: Optional[tuple] = None
+        self._moments: Optional[np.ndarray] = None
+        for asset in assets:
+            self.add(asset)
+
+    @property
+    def positions(self) -> Tuple[Position, ...]:
+        return tuple(self._positions)
+
+    @property
+    def assets(self) -> Tuple[Asset, ...]:
+        return tuple(position.asset for position in self._positions)
+
+    def add(self, asset: Asset, quantity: float = 1.0):
+        """
+        Add `quantity` units of `asset`, merging with its existing position if any.
+        Infinite streams (e.g. perpetuities) are rejected: they have no points to merge.
+        """
+        if np.isinf(asset.length()):
+            raise ValueError(f"Cannot hold an infinite stream in a portfolio: {asset!r}")
+        if id(asset) in self._index:
+            i = self._index[id(asset)]
+            self._positions[i] = replace(self._positions[i], quantity=self._positions[i].quantity + quantity)
+        else:
+            self._index[id(asset)] = len(self._positions)
+            self._positions.append(Position(asset, quantity))
+        self._update(asset, quantity)
+
+    def remove(self, asset: Asset, quantity: Optional[float] = None):
+        """Remove `quantity` units of `asset` (the whole position by default)."""
+        i = self._index[id(asset)]
+        position = self._positions[i]
+        if quantity is None or quantity >= position.quantity:
+            quantity = position.quantity
+            # Swap with the last position so that removal does not shift the list.
+            last = self._positions.pop()
+            del self._index[id(asset)]
+            if last is not position:
+                self._positions[i] = last
+                self._index[id(last.asset)] = i
+        else:
+            self._positions[i] = replace(position, quantity=position.quantity - quantity)
+        self._update(asset, -quantity)
+
+    def _update(self, asset: Asset, quantity: float):
+        self._grid = None
+        self.version += 1
+        if self._moments is not None and self._tracked.key() == self._tracked_key:
+            self._moments += quantity * np.array(asset.moments(self._tracked))
+        else:
+            self._moments = None
+
+    def track(self, policy: DiscountContext):
+        """Keep running present-value moments under `policy` (which must have scalar parameters)."""
+        assert policy.key() is not None
+        self._tracked = policy
+        self._tracked_key = None
+        self._moments = None
+
+    def moments(self, policy: DiscountContext) -> Tuple[float, float, float]:
+        if self._tracked is None or policy.key() is None or policy.key() != self._tracked.key():
+            return self.as_cash_flow().moments(policy)
+        if self._moments is None or self._tracked_key != self._tracked.key():
+            self._tracked_key = self._tracked.key()
+            self._moments = np.array(self.as_cash_flow().moments(self._tracked))
+        return tuple(self._moments)
+
+    def as_cash_flow(self) -> CashFlow:
+        """Merged cash-flow grid of the whole portfolio, rebuilt only after positions change."""
+        if self._grid is None:
+            if not self._positions:
+                return CashFlow.from_arrays(np.empty(0), np.empty(0))
+            times = np.concatenate([p.asset.times for p in self._positions])
+            values = np.concatenate([p.quantity * p.asset.values for p in self._positions])
+            grid, inverse = np.unique(times, return_inverse=True)
+            self._grid = CashFlow.from_arrays(grid, np.bincount(inverse, weights=values, minlength=len(grid)))
+        return self._grid
+
+    # The merged grid's arrays, so that a portfolio can stand wherever a cash flow's arrays are
+    # read (e.g. `CashFlowBatch.from_cash_flows`).
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.as_cash_flow().times
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.as_cash_flow().values
+
+    def length(self) -> int:
+        return self.as_cash_flow().length()
 
     def present_value(self, policy: DiscountContext) -> float:
-        return sum(asset.present_value(policy) for asset in self.assets)
+        return self.moments(policy)[0]
+
+    def risk(self, policy: DiscountContext) -> RiskMetrics:
+        return RiskMetrics.from_moments(*self.moments(policy), policy)
 
     def duration(self, policy: DiscountContext) -> float:
-        return sum(asset.duration(policy) for asset in self.assets)
+        return self.risk(policy).duration
 
     def modified_duration(self, policy: DiscountContext) -> float:
-        return sum(asset.modified_duration(policy) for asset in self.assets)
+        return self.risk(policy).modified_duration
 
     def convexity(self, policy: DiscountContext) -> float:
-        return sum(asset.convexity(policy) for asset in self.assets)
+        return self.risk(policy).convexity
 
     def __str__(self) -> str:
         s = ""
-        for asset in self.assets:
-            s += f"  {asset.name} (length: {asset.length()})\n"
+        for position in self._positions:
+            s += f"  {position.quantity:g} x {position.asset.name} (length: {position.asset.length()})\n"
         return s
@@ -0,0 +1,92 @@
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from cf.cash_flow import CashFlow
+from investing.portfolio import Portfolio
+from math_utils.chebyshev import Chebyshev
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+@dataclass
+class PriceSurrogate:
+    """
+    Price as a function of the yield, fitted once; every query costs O(degree) whatever the
+    length of the underlying cash flow. Only valid inside `[price.a, price.b]`.
+    """
+    price: Chebyshev
+    first: Chebyshev = field(init=False, repr=False)
+    second: Chebyshev = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.first = self.price.derivative(1)
+        self.second = self.price.derivative(2)
+
+    def __call__(self, y: np.ndarray) -> np.ndarray:
+        return self.price(y)
+
+    def modified_duration(self, y: np.ndarray) -> np.ndarray:
+        return -self.first(y) / self.price(y)
+
+    def convexity(self, y: np.ndarray) -> np.ndarray:
+        return self.second(y) / self.price(y)
+
+    def to_dict(self) -> dict:
+        return self.price.to_dict()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PriceSurrogate":
+        return cls(Chebyshev.from_dict(data))
+
+
+# Surrogates per instrument (by identity): the instrument's `version` when they were fitted and
+# the surrogates by pricing setup. Entries go away with their instrument.
+_CACHE: Dict[int, Tuple[Optional[int], Dict[tuple, PriceSurrogate]]] = {}
+
+
+def _cached(instrument) -> Dict[tuple, PriceSurrogate]:
+    """Surrogates of `instrument`, emptied if it changed since (e.g. `Portfolio.version`)."""
+    version = getattr(instrument, "version", None)
+    if id(instrument) not in _CACHE:
+        weakref.finalize(instrument, _CACHE.pop, id(instrument), None)
+    elif _CACHE[id(instrument)][0] == version:
+        return _CACHE[id(instrument)][1]
+    _CACHE[id(instrument)] = (version, {})
+    return _CACHE[id(instrument)][1]
+
+
+def price_surrogate(
+    instrument: Union[CashFlow, Portfolio],
+    y_min: float,
+    y_max: float,
+    discount: Callable = yearly_discount,
+    now: Optional[Time] = None,
+    tol: float = 1e-10,
+    **kwargs,
+) -> PriceSurrogate:
+    """
+    Surrogate of `instrument`'s price over yields in `[y_min, y_max]`, fitted with the real pricer
+    (one broadcasted evaluation per fitting round). Surrogates are cached per instrument and
+    pricing setup; a portfolio's are refitted once its positions change. Setups with array
+    parameters are not cached.
+    """
+    now = now or Time()
+    policy_key = DiscountContext(discount, now, kwargs).key()
+
+    def fit() -> PriceSurrogate:
+        return PriceSurrogate(Chebyshev.fit(
+            lambda ys: instrument.present_value(DiscountContext(discount, now, {**kwargs, "y": ys})),
+            y_min, y_max, tol,
+        ))
+
+    if policy_key is None:
+        return fit()
+    cache = _cached(instrument)
+    key = policy_key + (y_min, y_max, tol)
+    if key not in cache:
+        cache[key] = fit()
+    return cache[key]
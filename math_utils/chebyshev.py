@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+
+@dataclass
+class Chebyshev:
+    """Chebyshev series approximating a function on `[a, b]`."""
+    a: float
+    b: float
+    coefficients: np.ndarray
+
+    @classmethod
+    def fit(
+        cls,
+        f: Callable[[np.ndarray], np.ndarray],
+        a: float,
+        b: float,
+        tol: float = 1e-10,
+        max_degree: int = 512,
+    ) -> "Chebyshev":
+        """
+        Interpolate the vectorized `f` at Chebyshev points, doubling the degree until the
+        interpolant matches `f` within `tol` (relative to its scale) between the nodes.
+        Raises `ValueError` if `max_degree` is reached first.
+        """
+        degree = 8
+        while True:
+            approximation = cls(a, b, chebyshev.chebinterpolate(lambda x: f(cls._unmap(a, b, x)), degree))
+            # Midpoints between the interpolation nodes are where the error peaks.
+            check = np.cos(np.pi * np.arange(degree + 1) / (degree + 1))
+            exact = f(cls._unmap(a, b, check))
+            scale = max(1.0, np.abs(exact).max())
+            error = np.abs(approximation(cls._unmap(a, b, check)) - exact).max() / scale
+            if error <= tol:
+                return approximation
+            if degree >= max_degree:
+                raise ValueError(f"Relative error {error:.3g} above {tol:.3g} at degree {degree} (max_degree)")
+            degree = min(2 * degree, max_degree)
+
+    @staticmethod
+    def _unmap(a: float, b: float, x: np.ndarray) -> np.ndarray:
+        return a + (x + 1) * (b - a) / 2
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return chebyshev.chebval((2 * np.asarray(x) - self.a - self.b) / (self.b - self.a), self.coefficients)
+
+    def derivative(self, order: int = 1) -> "Chebyshev":
+        scale = (2 / (self.b - self.a)) ** order
+        return Chebyshev(self.a, self.b, chebyshev.chebder(self.coefficients, order) * scale)
+
+    def to_dict(self) -> dict:
+        return {"a": self.a, "b": self.b, "coefficients": self.coefficients.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Chebyshev":
+        return cls(data["a"], data["b"], np.asarray(data["coefficients"], dtype=float))
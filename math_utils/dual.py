@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+
+def _lift(x: Any) -> "Dual":
+    return x if isinstance(x, Dual) else Dual(np.asarray(x, dtype=float), 0.0, 0.0)
+
+
+@dataclass
+class Dual:
+    """
+    Second-order forward-mode number: a value with its first and second derivatives along one
+    or more seed directions. Seeded derivatives may carry a leading axis, one entry per seed
+    (second derivatives are then taken along each seed separately).
+    Supports the arithmetic, `np.exp`/`np.log`, sums and indexing used by the discount kernels.
+    """
+    value: Any
+    d1: Any
+    d2: Any
+
+    @classmethod
+    def variable(cls, value: float) -> "Dual":
+        return cls(np.asarray(value, dtype=float), np.ones(np.shape(value)), np.zeros(np.shape(value)))
+
+    @classmethod
+    def variables(cls, values: np.ndarray) -> "Dual":
+        """A vector of independent variables, one seed each."""
+        values = np.asarray(values, dtype=float)
+        return cls(values, np.eye(len(values)), np.zeros((len(values), len(values))))
+
+    def _chain(self, f: Any, f1: Any, f2: Any) -> "Dual":
+        """Apply a scalar function with value `f` and derivatives `f1`, `f2` at `self.value`."""
+        return Dual(f, f1 * self.d1, f2 * self.d1 ** 2 + f1 * self.d2)
+
+    def __add__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        return Dual(self.value + other.value, self.d1 + other.d1, self.d2 + other.d2)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.value, -self.d1, -self.d2)
+
+    def __sub__(self, other: Any) -> "Dual":
+        return self + -_lift(other)
+
+    def __rsub__(self, other: Any) -> "Dual":
+        return _lift(other) - self
+
+    def __mul__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        return Dual(
+            self.value * other.value,
+            self.d1 * other.value + self.value * other.d1,
+            self.d2 * other.value + 2 * self.d1 * other.d1 + self.value * other.d2,
+        )
+
+    __rmul__ = __mul__
+
+    def reciprocal(self) -> "Dual":
+        inverse = 1 / self.value
+        return self._chain(inverse, -inverse ** 2, 2 * inverse ** 3)
+
+    def __truediv__(self, other: Any) -> "Dual":
+        return self * _lift(other).reciprocal()
+
+    def __rtruediv__(self, other: Any) -> "Dual":
+        return _lift(other) * self.reciprocal()
+
+    def __pow__(self, exponent: Any) -> "Dual":
+        if isinstance(exponent, Dual):
+            return (exponent * self.log()).exp()
+        c = np.asarray(exponent, dtype=float)
+        return self._chain(self.value ** c, c * self.value ** (c - 1), c * (c - 1) * self.value ** (c - 2))
+
+    def __rpow__(self, base: Any) -> "Dual":
+        return (self * np.log(base)).exp()
+
+    def exp(self) -> "Dual":
+        e = np.exp(self.value)
+        return self._chain(e, e, e)
+
+    def log(self) -> "Dual":
+        return self._chain(np.log(self.value), 1 / self.value, -1 / self.value ** 2)
+
+    def sum(self, axis: int = -1) -> "Dual":
+        return Dual(np.sum(self.value, axis=axis), np.sum(self.d1, axis=axis), np.sum(self.d2, axis=axis))
+
+    def __getitem__(self, index: Any) -> "Dual":
+        # Index the value's own axes, which are the trailing axes of the derivatives.
+        if not isinstance(index, tuple):
+            index = (index,)
+        if not any(i is Ellipsis for i in index):
+            index = (Ellipsis,) + index
+        d1, d2 = (d if np.ndim(d) == 0 else d[index] for d in (self.d1, self.d2))
+        return Dual(self.value[index], d1, d2)
+
+    _UFUNCS = {
+        np.add: "__add__",
+        np.subtract: "__sub__",
+        np.multiply: "__mul__",
+        np.true_divide: "__truediv__",
+        np.power: "__pow__",
+        np.negative: "__neg__",
+        np.exp: "exp",
+        np.log: "log",
+    }
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or ufunc not in self._UFUNCS or kwargs:
+            return NotImplemented
+        first, *rest = inputs
+        return getattr(_lift(first), self._UFUNCS[ufunc])(*rest)
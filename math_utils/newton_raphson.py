@@ -1,4 +1,6 @@
-from typing import Callable
+from typing import Callable, Optional, Tuple
+
+import numpy as np
 
 def bisect(
     f: Callable[[float], float],
@@ -6,19 +8,164 @@ def bisect(
     b: float,
     eps: float
 ):
-    assert f(a) * f(b) < 0
+    fa, fb = f(a), f(b)
+    assert fa * fb < 0
 
     while b - a > eps:
         m = a + (b - a) / 2
-        if f(a) * f(m) < 0:
-            b = m
-        elif f(m) * f(b) < 0:
-            a = m
+        fm = f(m)
+        if fm == 0:
+            return m
+        if fa * fm < 0:
+            b, fb = m, fm
+        else:
+            a, fa = m, fm
 
     return a + (b - a) / 2
 
+def brent(
+    f: Callable[[float], float],
+    a: float,
+    b: float,
+    eps: float = 1e-12,
+    max_iter: int = 100,
+) -> float:
+    """
+    Brent's method: inverse quadratic interpolation and secant steps,
+    falling back to bisection whenever they do not shrink the bracket fast enough.
+    """
+    fa, fb = f(a), f(b)
+    assert fa * fb <= 0
+    c, fc = b, fb
+    d = e = b - a
+
+    for _ in range(max_iter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, fa = b, fb
+            b, fb = c, fc
+            c, fc = a, fa
+        tol = 2 * np.finfo(float).eps * abs(b) + eps / 2
+        mid = (c - b) / 2
+        if abs(mid) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * mid * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * mid * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * mid * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = mid
+        else:
+            d = e = mid
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if mid > 0 else -tol)
+        fb = f(b)
+
+    return b
+
 def newton_raphson(
     f: Callable[[float], float],
-    x0: float
-):
-   pass 
+    x0: float,
+    df: Callable[[float], float],
+    eps: float = 1e-12,
+    max_iter: int = 50,
+    bracket: Optional[Tuple[float, float]] = None,
+) -> float:
+    """
+    Newton's method with the analytic derivative `df`.
+    If a sign-changing `bracket` is given, steps leaving it are replaced by bisection,
+    and Brent's method takes over if Newton does not converge.
+    """
+    x = x0
+    if bracket is not None:
+        a, b = bracket
+        fa, fb = f(a), f(b)
+        assert fa * fb <= 0
+        # A root on an end of the bracket would never be bracketed by a strict sign change.
+        if fa == 0 or fb == 0:
+            return a if fa == 0 else b
+        if not min(a, b) < x < max(a, b):
+            x = a + (b - a) / 2
+
+    for _ in range(max_iter):
+        fx, dfx = f(x), df(x)
+        if fx == 0:
+            return x
+        if bracket is not None:
+            if fa * fx < 0:
+                b = x
+            else:
+                a, fa = x, fx
+        step = fx / dfx if dfx != 0 else np.inf
+        x_new = x - step
+        if bracket is not None and not min(a, b) < x_new < max(a, b):
+            x_new = a + (b - a) / 2
+        if abs(x_new - x) <= eps * max(1.0, abs(x)):
+            return x_new
+        x = x_new
+
+    if bracket is not None:
+        return brent(f, *bracket, eps=eps)
+    raise ArithmeticError(f"Newton-Raphson did not converge after {max_iter} iterations")
+
+def newton_raphson_vectorized(
+    f_df: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    x0: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+    eps: float = 1e-12,
+    max_iter: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Safeguarded Newton on many independent equations at once.
+    `f_df(x)` returns values and derivatives for the whole vector `x`. Each element keeps its own
+    bracket `[a, b]`; Newton steps leaving it fall back to bisection.
+    An element converges once its Newton correction `f / f'` is within `eps`, not when its
+    bracket merely collapses. Returns the roots and a mask of the elements that converged
+    (no sign change means no root).
+    """
+    x = np.array(x0, dtype=float)
+    a, b = np.broadcast_to(a, x.shape).astype(float), np.broadcast_to(b, x.shape).astype(float)
+    fa, _ = f_df(a)
+    fb, _ = f_df(b)
+    active = fa * fb <= 0
+    x = np.where((x > np.minimum(a, b)) & (x < np.maximum(a, b)), x, a + (b - a) / 2)
+    # Roots on an end of the bracket would never be bracketed by a strict sign change.
+    x = np.where(fa == 0, a, np.where(fb == 0, b, x))
+    converged = active & ((fa == 0) | (fb == 0))
+    active &= ~converged
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        fx, dfx = f_df(x)
+        root = active & (fx == 0)
+        converged |= root
+        active &= ~root
+        left = fa * fx < 0
+        b = np.where(active & left, x, b)
+        a, fa = np.where(active & ~left, x, a), np.where(active & ~left, fx, fa)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = fx / dfx
+        tol = eps * np.maximum(1.0, np.abs(x))
+        done = active & (np.abs(step) <= tol)
+        x_new = x - step
+        outside = ~((x_new > np.minimum(a, b)) & (x_new < np.maximum(a, b)))
+        x_new = np.where(outside & ~done, a + (b - a) / 2, x_new)
+        x = np.where(active, x_new, x)
+        converged |= done
+        # A bracket that collapses without a small correction has no root left to find.
+        active &= ~done & (np.abs(b - a) > tol)
+
+    return x, converged
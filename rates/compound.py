@@ -1,4 +1,7 @@
 import math
+from typing import Callable, Optional
+
+import numpy as np
 
 from rates.time import Time
 
@@ -6,4 +9,49 @@ def yearly_discount(time: Time, now: Time, y: float = 0.0) -> float:
     return 1 / (1 + y) ** (time.time - now.time)
 
 def continous_discount(time: Time, now: Time, y: float = 0.0) -> float:
-    return math.exp(-y * (time.time - now.time))
\ No newline at end of file
+    return math.exp(-y * (time.time - now.time))
+
+def periodic_discount(time: Time, now: Time, y: float = 0.0, m: int = 1) -> float:
+    return 1 / (1 + y / m) ** (m * (time.time - now.time))
+
+# Array kernels: `times`, `y` and `m` follow NumPy broadcasting rules.
+
+def periodic_discount_factors(times: np.ndarray, now: float, y=0.0, m=1) -> np.ndarray:
+    return (1 + y / m) ** (-m * (times - now))
+
+def yearly_discount_factors(times: np.ndarray, now: float, y=0.0) -> np.ndarray:
+    return periodic_discount_factors(times, now, y, 1)
+
+def continous_discount_factors(times: np.ndarray, now: float, y=0.0) -> np.ndarray:
+    return np.exp(-y * (times - now))
+
+# Array counterparts of the scalar kernels, used to discount whole time vectors at once.
+VECTORIZED = {
+    yearly_discount: yearly_discount_factors,
+    continous_discount: continous_discount_factors,
+    periodic_discount: periodic_discount_factors,
+}
+
+def vectorized(discount: Callable) -> Optional[Callable]:
+    """Array kernel of `discount`: its own `discount_factors` method (e.g. a curve) or a registered one."""
+    return getattr(discount, "discount_factors", None) or VECTORIZED.get(discount)
+
+# Flat-yield kernels: their discount factors are exponential in time.
+FLAT = (yearly_discount, continous_discount, periodic_discount)
+
+def is_flat(discount: Callable) -> bool:
+    return discount in FLAT
+
+# Compounding frequency per year of each kernel, needed for yield sensitivities.
+COMPOUNDING = {
+    yearly_discount: lambda kwargs: 1,
+    continous_discount: lambda kwargs: math.inf,
+    periodic_discount: lambda kwargs: kwargs.get("m", 1),
+}
+
+def compounding_frequency(discount: Callable, kwargs: dict) -> float:
+    if hasattr(discount, "compounding"):
+        return discount.compounding
+    if discount not in COMPOUNDING:
+        raise ValueError(f"Unknown compounding frequency for {discount}")
+    return COMPOUNDING[discount](kwargs)
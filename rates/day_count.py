@@ -0,0 +1,100 @@
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Calendar dates are numpy `datetime64[D]` arrays; anything `as_dates` accepts can be passed instead.
+Dates = Union[np.ndarray, Sequence[Union[str, date, datetime, np.datetime64]]]
+
+ROLLS = ("following", "modifiedfollowing", "preceding", "modifiedpreceding")
+
+
+def as_dates(dates: Dates) -> np.ndarray:
+    """Dates as `datetime64[D]`; timezone-aware datetimes (e.g. ledger timestamps) are taken in UTC."""
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return dates.astype("datetime64[D]")
+    if isinstance(dates, (str, date, np.datetime64)):
+        return as_dates([dates])[0]
+    return np.array([
+        d.astimezone(timezone.utc).replace(tzinfo=None) if isinstance(d, datetime) and d.tzinfo else d
+        for d in dates
+    ], dtype="datetime64[D]")
+
+
+def _ymd(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    months = dates.astype("datetime64[M]")
+    return (
+        dates.astype("datetime64[Y]").astype(np.int64) + 1970,
+        months.astype(np.int64) % 12 + 1,
+        (dates - months).astype(np.int64) + 1,
+    )
+
+
+def _thirty_360(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """30/360 (bond basis): day 31 counts as 30, and so does the end's when the start is a 30th."""
+    y1, m1, d1 = _ymd(start)
+    y2, m2, d2 = _ymd(end)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where(d1 == 30, np.minimum(d2, 30), d2)
+    return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360
+
+
+def _actual(basis: float):
+    return lambda start, end: (end - start).astype(np.int64) / basis
+
+
+CONVENTIONS = {
+    "ACT/365": _actual(365.0),
+    "ACT/360": _actual(360.0),
+    "30/360": _thirty_360,
+}
+
+# Year fractions already computed, per (reference day, convention) and then per day.
+_CACHE: Dict[Tuple[int, str], Dict[int, float]] = {}
+
+
+def year_fractions(dates: Dates, reference: Union[str, date, np.datetime64], convention: str = "ACT/365") -> np.ndarray:
+    """
+    Year fractions from `reference` to each of `dates` under `convention`. Only the distinct dates
+    not seen before for this (reference, convention) are computed, in one vectorized call, so
+    schedules sharing dates do not recompute them.
+    """
+    dates, reference = as_dates(dates), as_dates(reference)
+    cache = _CACHE.setdefault((int(reference.astype(np.int64)), convention), {})
+    days, inverse = np.unique(dates.astype(np.int64), return_inverse=True)
+    missing = np.fromiter((day not in cache for day in days.tolist()), dtype=bool, count=len(days))
+    if missing.any():
+        new = days[missing]
+        cache.update(zip(new.tolist(), CONVENTIONS[convention](reference, new.astype("datetime64[D]")).tolist()))
+    fractions = np.fromiter((cache[day] for day in days.tolist()), dtype=float, count=len(days))
+    return fractions[inverse].reshape(dates.shape)
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+def adjust(dates: Dates, roll: str = "following", holidays: Iterable = ()) -> np.ndarray:
+    """Dates moved to business days (weekdays that are not `holidays`) according to `roll`."""
+    assert roll in ROLLS
+    return np.busday_offset(as_dates(dates), 0, roll=roll, holidays=as_dates(list(holidays)))
+
+
+def schedule(
+    first: Union[str, date, np.datetime64],
+    periods: int,
+    m: int,
+    roll: Optional[str] = None,
+    holidays: Iterable = (),
+) -> np.ndarray:
+    """
+    `periods` dates `12 / m` months apart from `first`, keeping its day of the month (clipped to
+    the month's length), optionally adjusted to business days.
+    """
+    assert 12 % m == 0
+    first = as_dates(first)
+    _, _, day = _ymd(first)
+    months = first.astype("datetime64[M]") + np.arange(periods) * (12 // m)
+    length = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    dates = months.astype("datetime64[D]") + np.minimum(day, length) - 1
+    return dates if roll is None else adjust(dates, roll, holidays)
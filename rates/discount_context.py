@@ -1,14 +1,142 @@
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from typing import Any, Callable, Hashable, NamedTuple, Optional
 
+import numpy as np
+
+from rates.compound import compounding_frequency, vectorized
 from rates.time import Time
 
 
+def _leading_axes(value: Any, ndim: int) -> Any:
+    """Reshape an array-valued parameter so that its axes precede `ndim` time axes."""
+    if np.ndim(value) == 0:
+        return value
+    value = np.asarray(value)
+    return value.reshape(value.shape + (1,) * ndim)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DiscountCache:
+    """Bounded LRU map from discount keys to factors, counting hits and misses."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+def _parameters_key(kwargs: dict) -> Optional[tuple]:
+    """Hashable form of the discount parameters, or None if some parameter is not a plain scalar."""
+    if not all(np.isscalar(value) for value in kwargs.values()):
+        return None
+    return tuple(sorted(kwargs.items()))
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
 @dataclass
 class DiscountContext:
     discount: Callable[[Time, Time, Any], float]
     now: Time = field(default_factory=Time)
     kwargs: dict = field(default_factory=dict)
+    cache_size: int = 0
+
+    def __post_init__(self):
+        # Opt-in memoization keyed on the times, the kernel, `now` and the discount parameters.
+        # Per-point calls only gain from it with kernels costlier than a dict lookup (curves,
+        # custom kernels): the flat kernels are cheaper than any cache.
+        self._cache = DiscountCache(self.cache_size) if self.cache_size > 0 else None
+
+    def key(self, **overrides) -> Optional[tuple]:
+        """Hashable snapshot of the kernel, `now` and the parameters, or None if some parameter is an array."""
+        parameters = _parameters_key({**self.kwargs, **overrides})
+        return None if parameters is None else (self.discount, self.now.time, parameters)
 
     def __call__(self, time: Time) -> float:
+        if self._cache is None:
+            # Hot path for per-point pricing: no key, no intermediate objects.
+            return self.discount(time, self.now, **self.kwargs)
+        # The kernel, `now` and the parameters can all be reassigned on a caching context, so they
+        # are all in the key; only the sorting done by `key()` is left out of this hot path.
+        key = (self.discount, self.now.time, *self.kwargs.items(), time.time)
+        entries = self._cache.entries
+        try:
+            value = entries.get(key)
+        except TypeError:
+            # Array-valued parameters are unhashable: evaluate without caching.
+            return self._evaluate(time)
+        if value is None:
+            return self._cache.get(key, lambda: self._evaluate(time))
+        self._cache.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def _evaluate(self, time: Time) -> float:
         return self.discount(time, self.now, **self.kwargs)
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        return None if self._cache is None else self._cache.info()
+
+    def discount_factors(self, times: np.ndarray, **overrides) -> np.ndarray:
+        """
+        Discount factors for a whole vector of times, or for the times of a cash flow, in one call.
+        Array-valued parameters (from `kwargs` or `overrides`) add leading axes to the result:
+        `k` yields over `n` times give a `(k, n)` matrix.
+        Cached vectors are returned read-only.
+        """
+        times = np.asarray(getattr(times, "times", times), dtype=float)
+        kwargs = {**self.kwargs, **overrides}
+        key = None if self._cache is None else self.key(**overrides)
+        if key is None:
+            return self._discount_factors(times, kwargs)
+        key += (times.shape, times.tobytes())
+        return self._cache.get(key, lambda: _read_only(self._discount_factors(times, kwargs)))
+
+    def _discount_factors(self, times: np.ndarray, kwargs: dict) -> np.ndarray:
+        kernel = vectorized(self.discount)
+        if kernel is None:
+            return np.fromiter(
+                (self.discount(Time(t), self.now, **kwargs) for t in times.flat),
+                dtype=float, count=times.size,
+            ).reshape(times.shape)
+        kwargs = {key: _leading_axes(value, times.ndim) for key, value in kwargs.items()}
+        return kernel(times, self.now.time, **kwargs)
+
+    @property
+    def compounding(self) -> float:
+        return compounding_frequency(self.discount, self.kwargs)
+
+    @property
+    def periodic_yield(self) -> float:
+        """Yield per compounding period, the base of yield sensitivities."""
+        return np.asarray(self.kwargs.get("y", 0.0)) / self.compounding
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ShortRateModel(ABC):
+    """One-factor short-rate model simulated on a uniform grid, all paths at once."""
+    r0: float
+    kappa: float
+    theta: float
+    sigma: float
+
+    @abstractmethod
+    def step(self, r: np.ndarray, dt: float, z: np.ndarray) -> np.ndarray:
+        """Rates one step of `dt` after `r`, given standard normal draws `z`."""
+
+    def simulate(self, rng: np.random.Generator, n_paths: int, steps: int, dt: float) -> np.ndarray:
+        """Short-rate paths of shape `(n_paths, steps + 1)`, starting at `r0`."""
+        # Stored time-major so that each step writes one contiguous row.
+        rates = np.empty((steps + 1, n_paths))
+        rates[0] = self.r0
+        for k in range(steps):
+            rates[k + 1] = self.step(rates[k], dt, rng.standard_normal(n_paths))
+        return rates.T
+
+    def log_discount(self, rates: np.ndarray, dt: float) -> np.ndarray:
+        """`-integral(r)` from the start to every grid point (trapezoidal rule), per path."""
+        log_discount = np.zeros(rates.shape, order="F")
+        np.cumsum(-(rates[:, 1:] + rates[:, :-1]) * dt / 2, axis=1, out=log_discount[:, 1:])
+        return log_discount
+
+
+class Vasicek(ShortRateModel):
+    """dr = kappa (theta - r) dt + sigma dW, stepped with its exact Gaussian transition."""
+
+    def step(self, r: np.ndarray, dt: float, z: np.ndarray) -> np.ndarray:
+        decay = np.exp(-self.kappa * dt)
+        # Variance (1 - decay^2) / (2 kappa), tending to dt (Brownian motion) as kappa -> 0.
+        variance = dt if self.kappa == 0 else -np.expm1(-2 * self.kappa * dt) / (2 * self.kappa)
+        std = self.sigma * np.sqrt(variance)
+        return self.theta + (r - self.theta) * decay + std * z
+
+
+class CIR(ShortRateModel):
+    """dr = kappa (theta - r) dt + sigma sqrt(r) dW, stepped with full-truncation Euler."""
+
+    def step(self, r: np.ndarray, dt: float, z: np.ndarray) -> np.ndarray:
+        positive = np.maximum(r, 0.0)
+        return r + self.kappa * (self.theta - positive) * dt + self.sigma * np.sqrt(positive * dt) * z
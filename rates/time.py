@@ -1,5 +1,12 @@
 from dataclasses import dataclass
 
-@dataclass
+from rates.day_count import year_fractions
+
+@dataclass(slots=True)
 class Time:
     time: float = 0.0
+
+    @classmethod
+    def from_date(cls, day, reference, convention: str = "ACT/365") -> "Time":
+        """Time of the calendar date `day`, in years from `reference` (see `rates.day_count`)."""
+        return cls(float(year_fractions([day], reference, convention)[0]))
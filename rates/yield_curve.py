@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from math_utils.dual import Dual
+from math_utils.newton_raphson import brent
+from rates.time import Time
+
+INTERPOLATIONS = ("linear", "log_linear")
+
+
+@dataclass(eq=False)
+class YieldCurve:
+    """
+    Term structure of continuously compounded zero rates at sorted tenors (years from `now`).
+    Usable as the `discount` of a `DiscountContext`; the optional `y` parameter is a parallel
+    shift of the zero rates, so yield sensitivities are sensitivities to that shift.
+
+    `interpolation` is "linear" on zero rates or "log_linear" on discount factors.
+    Zero rates are extrapolated flat outside the tenors. They may be `Dual` numbers (see
+    `seed_nodes`) to carry derivatives with respect to the curve nodes through pricing.
+    """
+    tenors: np.ndarray
+    zero_rates: np.ndarray
+    interpolation: str = "linear"
+
+    # Zero rates are continuously compounded, so a parallel shift acts like a continuous yield.
+    compounding = np.inf
+
+    def __post_init__(self):
+        assert self.interpolation in INTERPOLATIONS
+        order = np.argsort(self.tenors)
+        self.tenors = np.ascontiguousarray(np.asarray(self.tenors, dtype=float)[order])
+        if isinstance(self.zero_rates, Dual):
+            self.zero_rates = self.zero_rates[order]
+        else:
+            self.zero_rates = np.ascontiguousarray(np.asarray(self.zero_rates, dtype=float)[order])
+        assert len(self.tenors) > 0 and self.tenors.shape == np.shape(getattr(self.zero_rates, "value", self.zero_rates))
+
+    def seed_nodes(self) -> "YieldCurve":
+        """Copy of the curve whose zero rates carry one derivative seed per node."""
+        return YieldCurve(self.tenors, Dual.variables(self.zero_rates), self.interpolation)
+
+    def __call__(self, time: Time, now: Time, y: float = 0.0) -> float:
+        return float(self.discount_factors(np.asarray(time.time), now.time, y))
+
+    def _segments(self, tau: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Left node of the segment containing each `tau` (binary search) and its weight, clipped to [0, 1]."""
+        if len(self.tenors) == 1:
+            return np.zeros(tau.shape, dtype=np.int64), np.zeros(tau.shape)
+        idx = np.clip(np.searchsorted(self.tenors, tau, side="right") - 1, 0, len(self.tenors) - 2)
+        left, right = self.tenors[idx], self.tenors[idx + 1]
+        return idx, np.clip((tau - left) / (right - left), 0.0, 1.0)
+
+    def zero_rate(self, tau: np.ndarray) -> np.ndarray:
+        """Interpolated zero rate at `tau` years from the valuation time."""
+        tau = np.asarray(tau, dtype=float)
+        idx, w = self._segments(tau)
+        nxt = np.minimum(idx + 1, len(self.tenors) - 1)
+        if self.interpolation == "linear":
+            return (1 - w) * self.zero_rates[idx] + w * self.zero_rates[nxt]
+        # Log-linear discount factors: interpolate rate * time between nodes, flat rates outside.
+        # Before the first node the rate is the first node's; the division is kept off those
+        # points (a node at tenor 0 would divide by zero) and masks blend the two, so Dual
+        # zero rates carry through.
+        inside = tau > self.tenors[0]
+        span = np.where(inside, np.minimum(tau, self.tenors[-1]), 1.0)
+        rt = self.zero_rates * self.tenors
+        return inside * (((1 - w) * rt[idx] + w * rt[nxt]) / span) + ~inside * self.zero_rates[idx]
+
+    def discount_factors(self, times: np.ndarray, now: float = 0.0, y=0.0) -> np.ndarray:
+        tau = times - now
+        return np.exp(-(self.zero_rate(tau) + y) * tau)
+
+    @classmethod
+    def bootstrap(
+        cls,
+        instruments: Sequence,
+        prices: Sequence[float],
+        interpolation: str = "linear",
+        bracket: Tuple[float, float] = (-0.5, 2.0),
+    ) -> "YieldCurve":
+        """
+        Curve repricing each instrument (e.g. a `Bond`) exactly, with one node at each maturity.
+        Nodes are solved in order of maturity, each one given the previous ones.
+        """
+        order = sorted(range(len(instruments)), key=lambda i: instruments[i].times.max())
+        maturities = np.array([instruments[i].times.max() for i in order])
+        assert np.all(np.diff(maturities) > 0), "Bootstrapping needs distinct maturities"
+        zero_rates = np.zeros(len(order))
+
+        for k, i in enumerate(order):
+            instrument = instruments[i]
+
+            def pricing_error(z: float) -> float:
+                zero_rates[k] = z
+                curve = cls(maturities[:k + 1], zero_rates[:k + 1], interpolation)
+                return np.dot(instrument.values, curve.discount_factors(instrument.times)) - prices[i]
+
+            zero_rates[k] = brent(pricing_error, *bracket)
+
+        return cls(maturities, zero_rates, interpolation)
@@ -0,0 +1,20 @@
+"""
+Loan amortization in closed form.
+"""
+
+import numpy as np
+
+from cf.amortization import amortization_schedule, level_payment, loan_rate
+
+
+def test_loan_rate_inverts_level_payment():
+    y = np.array([0.0, 0.001, 0.05, 0.25])
+    payment = level_payment(1000.0, y, 360)
+    assert np.allclose(loan_rate(1000.0, payment, 360), y, rtol=0, atol=1e-9)
+
+
+def test_schedule_repays_principal():
+    schedule = amortization_schedule(np.array([1000.0, 5000.0]), 0.06, np.array([12, 36]))
+    assert np.allclose(schedule.principal.sum(axis=-1), [1000.0, 5000.0])
+    assert np.allclose(schedule.balance[:, -1], 0.0, atol=1e-9)
+    assert np.allclose(schedule.payment, schedule.interest + schedule.principal)
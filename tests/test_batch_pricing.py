@@ -0,0 +1,51 @@
+"""
+Batch pricing across processes against pricing the packed book directly.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond, pack_bonds
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow
+from investing.batch_pricing import price_book, price_stream
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.yield_curve import YieldCurve
+
+
+METRICS = ("present_value", "duration", "modified_duration", "convexity")
+
+
+def book():
+    rng = np.random.default_rng(1)
+    return [
+        Bond(float(rate), 100, int(periods), int(m), f"bond {k}")
+        for k, (rate, periods, m) in enumerate(zip(rng.uniform(0, 0.1, 300), rng.integers(1, 60, 300), rng.choice([1, 2, 4], 300)))
+    ]
+
+
+def test_pack_bonds_matches_schedules():
+    bonds = book()[:20] + [Bond(0.0, 1000, 1, 1, "zero")]
+    packed, explicit = pack_bonds(bonds), CashFlowBatch.from_cash_flows([CashFlow.from_arrays(b.times, b.values) for b in bonds])
+    assert np.allclose(packed.times, explicit.times) and np.allclose(packed.values, explicit.values)
+    assert np.array_equal(packed.offsets, explicit.offsets)
+
+
+def test_price_book_matches_batch_risk():
+    instruments = book()
+    for policy in (
+        DiscountContext(yearly_discount, kwargs={"y": 0.05}),
+        DiscountContext(YieldCurve(np.array([1.0, 5.0, 20.0]), np.array([0.02, 0.03, 0.035]))),
+    ):
+        expected = CashFlowBatch.from_cash_flows(instruments).risk(policy)
+        for workers in (0, 2):
+            risk = price_book(instruments, policy, chunk_points=500, workers=workers)
+            for metric in METRICS:
+                assert np.allclose(getattr(risk, metric), getattr(expected, metric), rtol=1e-12), (workers, metric)
+
+
+def test_price_stream_covers_the_book_once():
+    instruments = book()[:50]
+    chunks = [chunk for chunk, _ in price_stream(instruments, DiscountContext(yearly_discount, kwargs={"y": 0.03}), 100, workers=0)]
+    covered = np.concatenate([np.arange(len(instruments))[chunk] for chunk in chunks])
+    assert sorted(covered.tolist()) == list(range(len(instruments)))
@@ -0,0 +1,48 @@
+"""
+Cash flow storage and algebra.
+"""
+
+import numpy as np
+
+from cf.cash_flow import CashFlow, Point
+from investing.asset import Asset
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+def test_points_round_trip_through_arrays():
+    points = [Point(Time(0.5), 10.0), Point(Time(1.0), -3.0), Point(Time(2.5), 110.0)]
+    flow = CashFlow(points)
+    assert flow.times.tolist() == [0.5, 1.0, 2.5]
+    assert flow.values.tolist() == [10.0, -3.0, 110.0]
+    assert flow.cash_flow == points
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+    assert np.isclose(flow.present_value(policy), sum(point.present_value(policy) for point in points))
+
+
+def test_equality_compares_points():
+    assert CashFlow([Point(Time(1), 1)]) == CashFlow([Point(Time(1), 1)])
+    assert CashFlow([Point(Time(1), 1)]) != CashFlow([Point(Time(2), 3)])
+    assert Asset([Point(Time(1), 1)], "a") != Asset([Point(Time(2), 1)], "a")
+
+
+def test_algebra():
+    a = CashFlow.from_arrays(np.array([1.0, 2.0]), np.array([10.0, 20.0]))
+    b = CashFlow.from_arrays(np.array([2.0, 3.0]), np.array([5.0, 5.0]))
+    difference = a - b
+    assert difference.times.tolist() == [1.0, 2.0, 3.0]
+    assert difference.values.tolist() == [10.0, 15.0, -5.0]
+    assert (2 * a).values.tolist() == [20.0, 40.0]
+    window = (a + b).window(1.5, 3.0)
+    assert window.times.tolist() == [2.0] and window.values.tolist() == [25.0]
+
+
+def test_combine_matches_pairwise_sum():
+    rng = np.random.default_rng(0)
+    flows = [CashFlow.from_arrays(np.sort(rng.integers(0, 40, 10)) / 4, rng.normal(size=10)) for _ in range(30)]
+    combined = CashFlow.combine(flows)
+    assert np.all(np.diff(combined.times) > 0)
+    total = sum(flows)
+    assert np.array_equal(combined.times, total.times)
+    assert np.allclose(combined.values, total.values)
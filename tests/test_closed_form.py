@@ -0,0 +1,74 @@
+"""
+Closed-form pricing against the explicit array path it replaces.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from bonds.bonds import Bond
+from cf.cash_flow import CashFlow, Point
+from cf.closed_form import geometric_moments
+from rates.compound import continous_discount, periodic_discount, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+POLICIES = [
+    DiscountContext(yearly_discount, kwargs={"y": 0.04}),
+    DiscountContext(continous_discount, now=Time(0.3), kwargs={"y": 0.07}),
+    DiscountContext(periodic_discount, kwargs={"y": 0.05, "m": 2}),
+]
+
+
+def direct_moments(v: float, n: int):
+    k = np.arange(n, dtype=float)
+    powers = v ** k
+    return math.fsum(powers), math.fsum(k * powers), math.fsum(k * k * powers)
+
+
+def array_path(flow: CashFlow) -> CashFlow:
+    return CashFlow.from_arrays(flow.times.copy(), flow.values.copy())
+
+
+def test_geometric_moments_match_direct_sums():
+    for n in (1, 2, 12, 360):
+        for v in (0.5, 0.9, 0.9995, 1.0, 1.0002, 1.2):
+            assert np.allclose(geometric_moments(v, n), direct_moments(v, n), rtol=1e-9, atol=1e-12), (v, n)
+    assert np.allclose(geometric_moments(0.9, np.inf), (10.0, 90.0, 1710.0))
+
+
+def test_bond_closed_form_matches_schedule():
+    bond = Bond(0.06, 100, 20, 2, "bond")
+    for policy in POLICIES:
+        closed, explicit = bond.risk(policy), array_path(bond).risk(policy)
+        for field in ("present_value", "duration", "modified_duration", "convexity"):
+            assert np.isclose(getattr(closed, field), getattr(explicit, field), rtol=1e-12), (policy, field)
+
+
+def test_bond_closed_form_with_yield_vector():
+    bond = Bond(0.03, 1000, 40, 4, "bond")
+    policy = DiscountContext(yearly_discount, kwargs={"y": np.array([0.0, 0.02, 0.1])})
+    assert np.allclose(bond.present_value(policy), array_path(bond).present_value(policy), rtol=1e-12)
+
+
+def test_geometric_moments_broadcast():
+    v, n = np.array([0.95, 1.0, 1.02]), np.array([[10], [40]])
+    g0, g1, g2 = geometric_moments(v, n)
+    assert g0.shape == g1.shape == g2.shape == (2, 3)
+    assert np.isclose(g2[1, 1], sum(k * k for k in range(40)))
+
+
+def test_geometric_moments_near_one():
+    # Just outside the old direct-summation cutoff, where the closed forms used to cancel.
+    for n in (1, 2, 12, 360, 1200):
+        for v in (0.99, 0.999, 0.9999, 1.0, 1.00107, 1.01, 1.05):
+            assert np.allclose(geometric_moments(v, n), direct_moments(v, n), rtol=1e-13, atol=1e-12), (v, n)
+
+
+def test_bond_schedule_is_read_only():
+    bond = Bond(0.05, 100, 10, 2, "bond")
+    assert len(bond.cash_flow) == 10
+    with pytest.raises(AttributeError, match="schedule follows from"):
+        bond.cash_flow = [Point(Time(1), 1)]
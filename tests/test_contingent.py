@@ -0,0 +1,53 @@
+"""
+Contingent annuities against explicit probability-weighted sums.
+"""
+
+import math
+
+import numpy as np
+
+from cf.cash_flow import CashFlow, Point
+from cf.contingent import ContingentAnnuity
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+# Exercise 3 of exercises/cap3.py: a 10000 annuity paid at the end of each year survived from 90.
+CURRENT_AGE = 90
+AGES = list(range(90, 102))
+PROBABILITIES = [.07, .08, .09, .10, .10, .10, .10, .10, .10, .07, .05, .04]
+PAYMENT = 10000
+POLICY = DiscountContext(yearly_discount, now=Time(CURRENT_AGE), kwargs={"y": 0.08})
+
+
+def present_value_till_age(age: int) -> float:
+    """The exercise's original pricing: one cash flow of the payments received before `age`."""
+    flow = CashFlow([Point(Time(a + 1), PAYMENT) for a in range(CURRENT_AGE, age)])
+    return flow.present_value(POLICY)
+
+
+def test_expected_present_value_matches_explicit_sum():
+    annuity = ContingentAnnuity([a + 1 for a in AGES[:-1]], PAYMENT, PROBABILITIES)
+    by_age = [present_value_till_age(age) for age in AGES]
+    assert np.allclose(annuity.present_values_by_count(POLICY), by_age)
+    expected = sum(pv * p for pv, p in zip(by_age, PROBABILITIES))
+    assert math.isclose(annuity.expected_present_value(POLICY), expected, rel_tol=1e-12)
+    variance = sum(pv ** 2 * p for pv, p in zip(by_age, PROBABILITIES)) - expected ** 2
+    assert math.isclose(annuity.variance(POLICY), variance, rel_tol=1e-9)
+
+
+def test_from_survival_matches_probabilities():
+    annuity = ContingentAnnuity([a + 1 for a in AGES[:-1]], PAYMENT, PROBABILITIES)
+    survival = 1 - np.cumsum(PROBABILITIES)[:-1]
+    from_survival = ContingentAnnuity.from_survival(annuity.times, PAYMENT, survival)
+    assert np.allclose(from_survival.probabilities, PROBABILITIES)
+    assert math.isclose(from_survival.expected_present_value(POLICY), annuity.expected_present_value(POLICY))
+
+
+def test_rate_scenarios_broadcast():
+    annuity = ContingentAnnuity([1.0, 2.0, 3.0], 1.0, [0.2, 0.3, 0.1, 0.4])
+    yields = np.array([0.0, 0.05])
+    values = annuity.expected_present_value(DiscountContext(yearly_discount, kwargs={"y": yields}))
+    assert np.isclose(values[0], 0.3 * 1 + 0.1 * 2 + 0.4 * 3)
+    assert np.isclose(values[1], annuity.expected_present_value(DiscountContext(yearly_discount, kwargs={"y": 0.05})))
@@ -0,0 +1,22 @@
+"""
+Day-count conventions and date schedules.
+"""
+
+import numpy as np
+
+from rates.day_count import schedule, year_fractions
+
+
+def test_day_counts():
+    reference = "2024-01-31"
+    dates = ["2024-02-29", "2024-03-31", "2025-01-31"]
+    assert np.allclose(year_fractions(dates, reference, "ACT/365"), np.array([29, 60, 366]) / 365)
+    assert np.allclose(year_fractions(dates, reference, "ACT/360"), np.array([29, 60, 366]) / 360)
+    # 30/360: the 31st counts as the 30th, at both ends once the start is a 30th.
+    assert np.allclose(year_fractions(dates, reference, "30/360"), np.array([29, 60, 360]) / 360)
+
+
+def test_schedule_clips_to_month_end():
+    dates = schedule("2024-01-31", 4, 12)
+    assert [str(d) for d in dates] == ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]
+    assert str(schedule("2024-06-01", 1, 1, roll="following")[0]) == "2024-06-03"
@@ -0,0 +1,35 @@
+"""
+Cash-flow matching in whole lots.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.cash_flow import Point
+from investing.asset import Asset
+from investing.dedication import dedicate
+from investing.portfolio import Portfolio
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+def test_dedicate_covers_liabilities():
+    bonds = [Bond(0.04 + 0.002 * k, 100, k, 1, f"{k}y") for k in range(1, 16)]
+    portfolio = Portfolio([Asset([Point(Time(t), -1000.0 * t)], f"L{t}") for t in range(1, 6)])
+    amounts = dedicate(portfolio, bonds, DiscountContext(yearly_discount, kwargs={"y": 0.05}))
+    # Whole units by default, as in `immunize`.
+    assert np.allclose(amounts, np.round(amounts))
+    # Cumulative net cash (no reinvestment) never goes negative.
+    grid = portfolio.as_cash_flow()
+    assert np.all(np.cumsum(grid.values[grid.times <= 5]) >= -1e-6)
+
+
+def test_dedicate_in_continuous_amounts():
+    bonds = [Bond(0.04 + 0.002 * k, 100, k, 1, f"{k}y") for k in range(1, 16)]
+    liabilities = [Asset([Point(Time(t), -1000.0 * t)], f"L{t}") for t in range(1, 6)]
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+    continuous = dedicate(Portfolio(liabilities), bonds, policy, lot_size=None)
+    whole = dedicate(Portfolio(liabilities), bonds, policy)
+    prices = np.array([bond.present_value(policy) for bond in bonds])
+    assert prices @ continuous <= prices @ whole + 1e-6
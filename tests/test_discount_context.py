@@ -0,0 +1,64 @@
+"""
+The opt-in discount-factor cache of DiscountContext.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+
+from rates.compound import continous_discount, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+TIMES = np.array([0.5, 1.0, 2.0, 10.0])
+
+
+def test_repeated_times_hit_the_cache():
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05}, cache_size=8)
+    first = policy.discount_factors(TIMES)
+    again = policy.discount_factors(TIMES.copy())
+    assert again is first and not first.flags.writeable
+    policy.discount_factors(TIMES[:2])
+    info = policy.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+
+def test_scalar_calls_hit_the_cache():
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05}, cache_size=8)
+    values = [policy(Time(t)) for t in (1.0, 2.0, 1.0, 1.0)]
+    assert values[0] == values[2] == values[3] and np.isclose(values[0], 1 / 1.05)
+    info = policy.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+def test_changed_now_or_parameters_give_fresh_factors():
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05}, cache_size=8)
+    policy.discount_factors(TIMES)
+    policy.now = Time(0.5)
+    assert np.allclose(policy.discount_factors(TIMES), 1.05 ** -(TIMES - 0.5))
+    policy.kwargs["y"] = 0.07
+    assert np.allclose(policy.discount_factors(TIMES), 1.07 ** -(TIMES - 0.5))
+    assert np.allclose(policy.discount_factors(TIMES, y=0.02), 1.02 ** -(TIMES - 0.5))
+    assert policy.cache_info().misses == 4 and policy.cache_info().hits == 0
+
+
+def test_replaced_kernel_gives_fresh_factors():
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05}, cache_size=8)
+    before = policy(Time(2.0)), policy.discount_factors(TIMES)
+    policy.discount = continous_discount
+    assert np.isclose(policy(Time(2.0)), np.exp(-0.1)) and not np.isclose(before[0], np.exp(-0.1))
+    assert np.allclose(policy.discount_factors(TIMES), np.exp(-0.05 * TIMES))
+    assert policy.cache_info().hits == 0
+
+
+def test_array_parameters_bypass_the_cache():
+    policy = DiscountContext(yearly_discount, kwargs={"y": np.array([0.01, 0.05])}, cache_size=8)
+    assert policy.discount_factors(TIMES).shape == (2, 4)
+    assert policy.cache_info().currsize == 0
+
+
+def test_uncached_matches_cached():
+    for discount in (yearly_discount, continous_discount):
+        cached = DiscountContext(discount, kwargs={"y": 0.04}, cache_size=4)
+        assert np.array_equal(cached.discount_factors(TIMES), replace(cached, cache_size=0).discount_factors(TIMES))
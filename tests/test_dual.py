@@ -0,0 +1,53 @@
+"""
+Forward-mode derivatives against central finite differences.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.cash_flow import CashFlow
+from math_utils.dual import Dual
+from rates.compound import continous_discount, periodic_discount, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.yield_curve import YieldCurve
+
+
+H = 1e-4
+
+
+def finite_differences(f, x: float):
+    f0, up, down = f(x), f(x + H), f(x - H)
+    return f0, (up - down) / (2 * H), (up - 2 * f0 + down) / H ** 2
+
+
+def test_elementary_functions():
+    x = Dual.variable(0.7)
+    for f in (lambda x: x * x * x, lambda x: 1 / (1 + x), lambda x: np.exp(-2 * x), np.log, lambda x: (1 + x) ** -3.5):
+        d = f(x)
+        assert np.allclose((d.value, d.d1, d.d2), finite_differences(f, 0.7), rtol=1e-6)
+
+
+def test_yield_derivatives_match_finite_differences():
+    bond = Bond(0.05, 100, 20, 2, "bond")
+    flow = CashFlow.from_arrays(bond.times.copy(), bond.values.copy())
+    for discount, kwargs in ((yearly_discount, {"y": 0.04}), (continous_discount, {"y": 0.04}), (periodic_discount, {"y": 0.04, "m": 2})):
+        policy = DiscountContext(discount, kwargs=kwargs)
+
+        def pv(y: float) -> float:
+            return flow.present_value(DiscountContext(discount, kwargs={**kwargs, "y": y}))
+
+        assert np.allclose(flow.present_value_derivatives(policy), finite_differences(pv, 0.04), rtol=1e-6)
+
+
+def test_curve_node_gradient_matches_bumps():
+    flow = CashFlow.from_arrays(np.array([0.5, 1.0, 2.5, 4.0, 7.0]), np.array([3.0, 3.0, 3.0, 3.0, 103.0]))
+    for interpolation in ("linear", "log_linear"):
+        curve = YieldCurve(np.array([0.25, 1.0, 3.0, 5.0]), np.array([0.02, 0.025, 0.03, 0.032]), interpolation)
+        gradient = flow.present_value(DiscountContext(curve.seed_nodes())).d1
+        for node in range(4):
+            def pv(bump: float) -> float:
+                rates = curve.zero_rates.copy()
+                rates[node] += bump
+                return flow.present_value(DiscountContext(YieldCurve(curve.tenors, rates, interpolation)))
+
+            assert np.isclose(gradient[node], finite_differences(pv, 0.0)[1], rtol=1e-6, atol=1e-9)
@@ -0,0 +1,44 @@
+"""
+Scenario grids against pricing each (yield, valuation date) pair on its own.
+"""
+
+import numpy as np
+
+import investing.horizon as horizon
+from bonds.bonds import Bond
+from cf.cash_flow import CashFlow
+from investing.horizon import scenario_grid
+from rates.compound import periodic_discount, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+def test_grid_cells_match_direct_pricing(monkeypatch):
+    assets = [
+        Bond(0.05, 100, 20, 2, "bond"),
+        CashFlow.from_arrays(np.array([0.25, 1.0, 4.0]), np.array([-50.0, 20.0, 40.0])),
+        Bond(0.0, 1000, 1, 1, "zero"),
+    ]
+    yields, dates = np.array([0.01, 0.04, 0.08]), np.array([0.0, 0.6, 3.0])
+    # Dates after some payments: those are carried forward to the valuation date.
+    expected = scenario_grid(assets, yields, dates, periodic_discount, m=2)
+
+    # A budget of a few cells per chunk forces the flows through many chunks.
+    monkeypatch.setattr(horizon, "SCENARIO_BUDGET", 2 * yields.size * dates.size)
+    chunked = scenario_grid(assets, yields, dates, periodic_discount, m=2)
+    for metric in ("present_value", "duration", "modified_duration", "convexity"):
+        assert np.allclose(getattr(chunked, metric), getattr(expected, metric), rtol=1e-12)
+
+    for i, asset in enumerate(assets):
+        for j, y in enumerate(yields):
+            for k, date in enumerate(dates):
+                policy = DiscountContext(periodic_discount, now=Time(date), kwargs={"y": y, "m": 2})
+                risk = CashFlow.from_arrays(asset.times, asset.values).risk(policy)
+                assert np.isclose(expected.present_value[i, j, k], risk.present_value, rtol=1e-12)
+                assert np.isclose(expected.duration[i, j, k], risk.duration, rtol=1e-12)
+                assert np.isclose(expected.convexity[i, j, k], risk.convexity, rtol=1e-12)
+
+
+def test_grid_shape():
+    grid = scenario_grid([Bond(0.03, 100, 5, 1, "a")] * 4, np.linspace(0, 0.1, 7), np.arange(3.0), yearly_discount)
+    assert grid.present_value.shape == (4, 7, 3)
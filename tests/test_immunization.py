@@ -0,0 +1,29 @@
+"""
+Immunization in whole lots.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.cash_flow import Point
+from investing.asset import Asset
+from investing.immunization import immunize
+from investing.portfolio import Portfolio
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+POLICY = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+
+
+def test_immunize_in_lots():
+    bonds = [Bond(0.04 + 0.002 * k, 100, k, 1, f"{k}y") for k in range(1, 16)]
+    portfolio = Portfolio([Asset([Point(Time(7), -100000)], "liability")])
+    amounts = immunize(portfolio, bonds, POLICY, lot_size=10)
+    assert np.allclose(amounts % 10, 0)
+    l0, l1, l2 = portfolio.moments(POLICY)
+    assert l0 >= -1e-6
+    # Net first moment within the default tolerance of 0.01 years per unit of liability.
+    assert abs(l1) <= 0.01 * 100000 * POLICY.discount_factors(np.array([7.0]))[0] + 1e-6
+    assert l2 >= -1e-6
@@ -0,0 +1,42 @@
+"""
+Key-rate durations against parallel shifts.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.cash_flow import CashFlow
+from investing.key_rates import key_rate_durations, key_rate_weights
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+
+
+POLICY = DiscountContext(yearly_discount, kwargs={"y": 0.045})
+TENORS = np.array([1.0, 2.0, 5.0, 10.0, 30.0])
+
+
+def instruments():
+    return [
+        Bond(0.05, 100, 20, 2, "10y"),
+        Bond(0.02, 100, 60, 2, "30y"),
+        CashFlow.from_arrays(np.array([0.5, 3.0, 40.0]), np.array([10.0, -4.0, 25.0])),
+    ]
+
+
+def test_profiles_add_up_to_a_parallel_shift():
+    tau = np.linspace(0, 50, 201)
+    assert np.allclose(key_rate_weights(TENORS, tau).sum(axis=0), 1.0)
+
+
+def test_key_rate_durations_sum_to_effective_duration():
+    sensitivities = key_rate_durations(instruments(), POLICY, TENORS)
+    # A single key rate moves the whole curve: its duration is the parallel-shift effective duration.
+    parallel = key_rate_durations(instruments(), POLICY, TENORS[:1]).durations[:, 0]
+    assert np.allclose(sensitivities.durations.sum(axis=1), parallel, rtol=1e-6)
+    for i, instrument in enumerate(instruments()):
+        flow = CashFlow.from_arrays(instrument.times, instrument.values)
+        pvs = flow.values * POLICY.discount_factors(flow.times)
+        # -d/ds of sum(pv * exp(-s * tau)) at s = 0 per unit of PV, up to the O(bump ** 2) difference error.
+        assert np.isclose(parallel[i], np.dot(flow.times, pvs) / pvs.sum(), rtol=1e-5)
+        assert np.isclose(sensitivities.present_value[i], pvs.sum())
+    assert np.allclose(sensitivities.dv01, sensitivities.durations * sensitivities.present_value[:, None] * 1e-4)
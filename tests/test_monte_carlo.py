@@ -0,0 +1,41 @@
+"""
+Monte Carlo pricing under short-rate models.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.cash_flow import CashFlow
+from investing.monte_carlo import simulate
+from rates.compound import continous_discount
+from rates.discount_context import DiscountContext
+from rates.short_rate import CIR, Vasicek
+
+
+FLOW = CashFlow.from_arrays(np.array([0.5, 1.0, 2.25, 10.0]), np.array([5.0, 5.0, 5.0, 105.0]))
+
+
+def test_reproducible_across_worker_counts():
+    bond = Bond(0.04, 100, 20, 2, "bond")
+    for model in (Vasicek(0.03, 0.5, 0.04, 0.01), CIR(0.03, 0.5, 0.04, 0.05)):
+        serial = simulate(bond, model, 5000, seed=7, shard_size=1000, workers=0)
+        pooled = simulate(bond, model, 5000, seed=7, shard_size=1000, workers=2)
+        assert np.array_equal(serial.values, pooled.values)
+        assert np.isclose(serial.mean, pooled.mean, rtol=1e-12) and np.isclose(serial.std, pooled.std, rtol=1e-9)
+        assert serial.quantiles == pooled.quantiles
+        assert not np.array_equal(serial.values, simulate(bond, model, 5000, seed=8, shard_size=1000, workers=0).values)
+
+
+def test_vasicek_without_volatility_is_deterministic_discounting():
+    # Starting at its mean level, the rate stays there: continuous discounting at r0.
+    result = simulate(FLOW, Vasicek(0.05, 0.3, 0.05, 0.0), 200, seed=1, workers=0)
+    expected = FLOW.present_value(DiscountContext(continous_discount, kwargs={"y": 0.05}))
+    assert np.allclose(result.values, expected, rtol=1e-12)
+    assert result.std < 1e-9
+
+
+def test_vasicek_without_mean_reversion():
+    result = simulate(FLOW, Vasicek(0.05, 0.0, 0.05, 0.0), 200, seed=1, workers=0)
+    expected = FLOW.present_value(DiscountContext(continous_discount, kwargs={"y": 0.05}))
+    assert np.allclose(result.values, expected, rtol=1e-12)
+    assert np.all(np.isfinite(simulate(FLOW, Vasicek(0.05, 0.0, 0.05, 0.01), 200, seed=1, workers=0).values))
@@ -0,0 +1,46 @@
+"""
+Portfolio positions and their running present-value moments.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from investing.portfolio import Portfolio
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+
+
+POLICY = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+
+
+def test_tracked_moments_follow_add_and_remove():
+    a, b, c, d, e = (Bond(0.01 * k, 100, 2 * k, 2, f"bond {k}") for k in range(1, 6))
+    portfolio = Portfolio([a, b, c, d])
+    portfolio.track(POLICY)
+    portfolio.moments(POLICY)
+
+    portfolio.add(e, 2.0)
+    portfolio.remove(b)  # a middle position: the last one is swapped into its slot
+    assert [position.asset for position in portfolio.positions] == [a, e, c, d]
+    portfolio.add(b, 3.0)
+    portfolio.remove(c, 0.25)
+    portfolio.add(a, -0.5)
+
+    expected = {id(a): 0.5, id(b): 3.0, id(c): 0.75, id(d): 1.0, id(e): 2.0}
+    assert {id(p.asset): p.quantity for p in portfolio.positions} == expected
+
+    fresh = Portfolio([])
+    for position in portfolio.positions:
+        fresh.add(position.asset, position.quantity)
+    tracked = portfolio.moments(POLICY)
+    assert np.allclose(tracked, fresh.moments(POLICY), rtol=1e-12)
+    assert np.allclose(tracked, portfolio.as_cash_flow().moments(POLICY), rtol=1e-12)
+
+
+def test_untracked_policy_prices_the_grid():
+    a, b = Bond(0.03, 100, 10, 1, "a"), Bond(0.05, 100, 6, 2, "b")
+    portfolio = Portfolio([a, b])
+    portfolio.track(POLICY)
+    other = DiscountContext(yearly_discount, kwargs={"y": 0.09})
+    expected = np.add(a.moments(other), b.moments(other))
+    assert np.allclose(portfolio.moments(other), expected, rtol=1e-12)
@@ -0,0 +1,60 @@
+"""
+Root finders against known roots, and the yield solver built on them.
+"""
+
+import math
+
+import numpy as np
+
+from bonds.bonds import Bond
+from math_utils.newton_raphson import bisect, brent, newton_raphson, newton_raphson_vectorized
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+
+
+def cubic(x: float) -> float:
+    return x ** 3 - 2 * x - 5
+
+
+# Wallis' cubic, the classic test of root finders.
+CUBIC_ROOT = 2.0945514815423265
+
+
+def test_bisect():
+    assert abs(bisect(lambda x: x * x - 2, 0, 2, 1e-12) - math.sqrt(2)) < 1e-11
+
+
+def test_brent():
+    assert abs(brent(cubic, 2, 3) - CUBIC_ROOT) < 1e-12
+    assert abs(brent(lambda x: math.cos(x) - x, 0, 1) - 0.7390851332151607) < 1e-12
+
+
+def test_newton_raphson():
+    assert abs(newton_raphson(cubic, 2.0, lambda x: 3 * x * x - 2) - CUBIC_ROOT) < 1e-12
+    # A start far outside the bracket is pulled back into it.
+    root = newton_raphson(math.log, 50.0, lambda x: 1 / x, bracket=(0.1, 3.0))
+    assert abs(root - 1.0) < 1e-12
+
+
+def test_newton_raphson_vectorized():
+    targets = np.array([2.0, 9.0, 0.25, -1.0])
+    x, converged = newton_raphson_vectorized(lambda x: (x * x - targets, 2 * x), np.ones(4), 0.0, 5.0)
+    assert converged.tolist() == [True, True, True, False]
+    assert np.allclose(x[:3], np.sqrt(targets[:3]), rtol=0, atol=1e-12)
+
+
+def test_root_on_bracket_end():
+    # x (x + 1) has its only root in [0, 1] at the left end, where the residual is exactly zero.
+    f = lambda x: x * (x + 1)
+    assert brent(f, 0.0, 1.0) == 0.0
+    assert newton_raphson(f, 0.5, lambda x: 2 * x + 1, bracket=(0.0, 1.0)) == 0.0
+    assert newton_raphson(f, 0.5, lambda x: 2 * x + 1, bracket=(-0.5, 0.0)) == 0.0
+    x, converged = newton_raphson_vectorized(lambda x: (f(x), 2 * x + 1), np.array([0.5, 0.5]), [0.0, -0.5], [1.0, 0.0])
+    assert converged.tolist() == [True, True]
+    assert x.tolist() == [0.0, 0.0]
+
+
+def test_implicit_rate_recovers_pricing_yield():
+    bond = Bond(0.04, 100, 30, 2, "bond")
+    price = bond.present_value(DiscountContext(yearly_discount, kwargs={"y": 0.0613}))
+    assert abs(bond.implicit_rate(price) - 0.0613) < 1e-10
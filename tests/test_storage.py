@@ -0,0 +1,36 @@
+"""
+Universes stored as memory-mapped column files.
+"""
+
+import numpy as np
+
+from bonds.bonds import Bond
+from cf.batch import CashFlowBatch
+from cf.cash_flow import CashFlow, Point
+from cf.storage import open_universe, write_universe
+from investing.asset import Asset
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+def test_round_trip_through_memory_maps(tmp_path):
+    instruments = [
+        Bond(0.05, 100, 10, 2, "bond"),
+        CashFlow.from_arrays(np.empty(0), np.empty(0)),
+        Asset([Point(Time(0.5), -1.0), Point(Time(7.0), 3.0)], "asset"),
+        Bond(0.02, 1000, 3, 1, "short"),
+    ]
+    write_universe(str(tmp_path / "universe"), instruments)
+
+    universe = open_universe(str(tmp_path / "universe"))
+    assert isinstance(universe.batch.times, np.memmap)
+    assert universe.names == ["bond", None, "asset", "short"]
+    assert len(universe) == 4
+    for i, instrument in enumerate(instruments):
+        assert np.array_equal(universe[i].times, instrument.times)
+        assert np.array_equal(universe[i].values, instrument.values)
+
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.04})
+    packed = CashFlowBatch.from_cash_flows(instruments)
+    assert np.allclose(universe.batch.present_values(policy, chunk=3), packed.present_values(policy))
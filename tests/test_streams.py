@@ -0,0 +1,33 @@
+"""
+Geometric streams: closed forms against their generated points.
+"""
+
+import numpy as np
+
+from cf.cash_flow import CashFlow
+from cf.streams import annuity, growing_annuity, perpetuity
+from rates.compound import continous_discount, periodic_discount, yearly_discount
+from rates.discount_context import DiscountContext
+from rates.time import Time
+
+
+POLICIES = [
+    DiscountContext(yearly_discount, kwargs={"y": 0.04}),
+    DiscountContext(continous_discount, now=Time(0.3), kwargs={"y": 0.07}),
+    DiscountContext(periodic_discount, kwargs={"y": 0.05, "m": 2}),
+]
+
+
+def test_streams_closed_form_matches_points():
+    streams = [annuity(10, 25, 12), growing_annuity(5, 0.01, 40, 4, start=0.0), annuity(1, 1)]
+    for stream in streams:
+        explicit = CashFlow.from_arrays(stream.times, stream.values)
+        for policy in POLICIES:
+            assert np.allclose(stream.moments(policy), explicit.moments(policy), rtol=1e-9)
+
+
+def test_perpetuity_is_limit_of_annuity():
+    policy = DiscountContext(yearly_discount, kwargs={"y": 0.05})
+    assert np.isclose(perpetuity(1).present_value(policy), 20.0)
+    assert np.isclose(annuity(1, 2000).present_value(policy), 20.0)
+    assert np.isinf(growing_annuity(1, 0.06, np.inf).present_value(policy))
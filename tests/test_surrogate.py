@@ -0,0 +1,61 @@
+"""
+Chebyshev price-yield surrogates.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+
+import investing.surrogate as surrogate
+from bonds.bonds import Bond
+from investing.portfolio import Portfolio
+from investing.surrogate import PriceSurrogate, price_surrogate
+from math_utils.chebyshev import Chebyshev
+from rates.compound import yearly_discount
+from rates.discount_context import DiscountContext
+
+
+def test_surrogate_matches_exact_pricing():
+    bond = Bond(0.05, 100, 60, 2, "bond")
+    fitted = price_surrogate(bond, 0.0, 0.15, tol=1e-10)
+    ys = np.linspace(0.0, 0.15, 37)
+    exact = bond.present_value(DiscountContext(yearly_discount, kwargs={"y": ys}))
+    assert np.max(np.abs(fitted(ys) - exact)) <= 1e-10 * np.max(np.abs(exact))
+    risk = bond.risk(DiscountContext(yearly_discount, kwargs={"y": 0.07}))
+    assert np.isclose(fitted.modified_duration(0.07), risk.modified_duration, rtol=1e-8)
+    assert np.isclose(fitted.convexity(0.07), risk.convexity, rtol=1e-6)
+    assert price_surrogate(bond, 0.0, 0.15, tol=1e-10) is fitted
+
+
+def test_surrogate_serializes():
+    fitted = price_surrogate(Bond(0.03, 100, 20, 1, "bond"), 0.0, 0.1)
+    restored = PriceSurrogate.from_dict(fitted.to_dict())
+    assert np.allclose(restored(np.linspace(0, 0.1, 5)), fitted(np.linspace(0, 0.1, 5)), rtol=0, atol=0)
+
+
+def test_fit_fails_when_tolerance_is_unreachable():
+    with pytest.raises(ValueError):
+        Chebyshev.fit(np.abs, -1.0, 1.0, tol=1e-12, max_degree=64)
+
+
+def test_portfolio_changes_refit():
+    a, b = Bond(0.05, 100, 20, 2, "a"), Bond(0.02, 100, 6, 1, "b")
+    portfolio = Portfolio([a])
+    first = price_surrogate(portfolio, 0.0, 0.1)
+    assert price_surrogate(portfolio, 0.0, 0.1) is first
+    portfolio.add(b)
+    refitted = price_surrogate(portfolio, 0.0, 0.1)
+    assert refitted is not first
+    expected = portfolio.present_value(DiscountContext(yearly_discount, kwargs={"y": 0.04}))
+    assert np.isclose(refitted(0.04), expected, rtol=1e-9)
+
+
+def test_cache_entry_goes_with_its_instrument():
+    bond = Bond(0.05, 100, 20, 2, "short-lived")
+    price_surrogate(bond, 0.0, 0.1)
+    key = id(bond)
+    assert key in surrogate._CACHE
+    del bond
+    gc.collect()
+    assert key not in surrogate._CACHE
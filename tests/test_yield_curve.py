@@ -0,0 +1,16 @@
+"""
+Zero-rate interpolation of yield curves.
+"""
+
+import numpy as np
+
+from rates.yield_curve import YieldCurve
+
+
+def test_log_linear_curve_with_node_at_zero():
+    curve = YieldCurve(np.array([0.0, 1.0, 2.0]), np.array([0.01, 0.02, 0.03]), "log_linear")
+    rates = curve.zero_rate(np.array([0.0, 0.5, 1.0, 3.0]))
+    assert np.all(np.isfinite(rates))
+    assert np.allclose(rates[[0, 2, 3]], [0.01, 0.02, 0.03])
+    seeded = curve.seed_nodes().zero_rate(np.array([0.0, 0.5]))
+    assert np.all(np.isfinite(seeded.value)) and np.all(np.isfinite(seeded.d1))